@@ -99,8 +99,9 @@ Be very strict in identifying sensitive variables, even when uncertain."""
         analysis_session_id = f"analysis_{int(time.time())}"
         
         try:
-            # Ensure Ollama is running and model is available
-            if not self.ollama_client.check_ollama_status():
+            # Ensure Ollama is running and model is available (one /api/tags request)
+            available_models = self.ollama_client.get_available_models()
+            if not self.ollama_client.is_running:
                 return {
                     "error": "Ollama service not available",
                     "session_id": analysis_session_id,
@@ -108,7 +109,6 @@ Be very strict in identifying sensitive variables, even when uncertain."""
                 }
             
             # Check if model is available
-            available_models = self.ollama_client.get_available_models()
             if model not in available_models:
                 return {
                     "error": f"Model {model} not available. Available models: {available_models}",
@@ -21,6 +21,28 @@ try:
 except ImportError:
     MAC_SILICON_OPTIMIZER_AVAILABLE = False
 
+# (connect, read) timeout in seconds for streamed generation; the read timeout bounds
+# the wait for each chunk, so a stalled stream fails instead of blocking forever
+STREAM_TIMEOUT = (5, 60)
+
+# System prompt for practice chats, sent byte-for-byte identically so Ollama can reuse its prompt cache
+SECURITY_MENTOR_SYSTEM_PROMPT = """You are an AI Security Mentor helping users learn secure coding practices. 
+
+Your role is to:
+1. Analyze code for potential data leaks (API keys, PII, medical records, internal infrastructure)
+2. Explain what was detected and why it's a security risk
+3. Provide specific, actionable fixes for the identified issues
+4. Teach secure coding practices and best practices
+5. Keep responses concise, clear, and educational
+
+When analyzing code:
+- Point out specific lines or patterns that contain sensitive data
+- Explain the security risk clearly
+- Provide concrete examples of how to fix the issues
+- Focus on practical solutions
+
+Be helpful, educational, and security-focused in all responses."""
+
 class OllamaClient:
     def __init__(self, base_url: str = "http://localhost:11434"):
         self.base_url = base_url
@@ -66,16 +88,22 @@ class OllamaClient:
             return False
     
     def get_available_models(self) -> List[str]:
-        """Get list of available models"""
-        if not self.check_ollama_status():
+        """Get list of available models (also refreshes is_running)"""
+        # A single /api/tags request doubles as the status check
+        try:
+            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+        except requests.exceptions.RequestException:
+            self.is_running = False
+            return []
+        
+        self.is_running = response.status_code == 200
+        if not self.is_running:
             return []
         
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
-            if response.status_code == 200:
-                data = response.json()
-                self.available_models = [model["name"] for model in data.get("models", [])]
-                return self.available_models
+            data = response.json()
+            self.available_models = [model["name"] for model in data.get("models", [])]
+            return self.available_models
         except Exception as e:
             print(f"Error getting models: {e}")
         
@@ -114,28 +142,34 @@ class OllamaClient:
             return True
         return False
     
+    def _build_generate_payload(self, prompt: str, stream: bool) -> Dict:
+        """Build the /api/generate request payload for the current model"""
+        payload = {
+            "model": self.current_model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": 0.0,  # Set to 0 for deterministic results
+                "top_p": 0.9,
+                "repeat_penalty": 1.1,
+                "seed": 42  # Fixed seed for reproducibility
+            }
+        }
+        
+        # Add Mac Silicon optimizations if available
+        if self.optimizer:
+            optimized_config = self.optimizer.optimize_ollama_config()
+            payload.update(optimized_config)
+        
+        return payload
+    
     def generate_response(self, prompt: str, stream: bool = False) -> Optional[str]:
         """Generate response from the current model"""
         if not self.current_model or not self.check_ollama_status():
             return None
         
         try:
-            payload = {
-                "model": self.current_model,
-                "prompt": prompt,
-                "stream": stream,
-                "options": {
-                    "temperature": 0.0,  # Set to 0 for deterministic results
-                    "top_p": 0.9,
-                    "repeat_penalty": 1.1,
-                    "seed": 42  # Fixed seed for reproducibility
-                }
-            }
-            
-            # Add Mac Silicon optimizations if available
-            if self.optimizer:
-                optimized_config = self.optimizer.optimize_ollama_config()
-                payload.update(optimized_config)
+            payload = self._build_generate_payload(prompt, stream)
             
             response = requests.post(
                 f"{self.base_url}/api/generate",
@@ -155,6 +189,43 @@ class OllamaClient:
         
         return None
     
+    def generate_response_chunks(self, prompt: str) -> Generator[Dict, None, None]:
+        """Stream raw response chunks from the current model.
+        
+        Each chunk carries a piece of 'response' text; the final chunk has
+        'done' set along with Ollama's token counts and timing info.
+        Closing the generator early aborts the request. A stream that stalls
+        longer than the read timeout raises requests.exceptions.RequestException.
+        """
+        if not self.current_model or not self.check_ollama_status():
+            return
+        
+        try:
+            response = requests.post(
+                f"{self.base_url}/api/generate",
+                json=self._build_generate_payload(prompt, True),
+                stream=True,
+                timeout=STREAM_TIMEOUT
+            )
+        except Exception as e:
+            print(f"Error generating response: {e}")
+            return
+        
+        try:
+            if response.status_code != 200:
+                return
+            for line in response.iter_lines():
+                if line:
+                    try:
+                        data = json.loads(line.decode('utf-8'))
+                    except json.JSONDecodeError:
+                        continue
+                    yield data
+                    if data.get("done", False):
+                        break
+        finally:
+            response.close()
+    
     def _handle_stream_response(self, response) -> Generator[str, None, None]:
         """Handle streaming response"""
         for line in response.iter_lines():
@@ -266,24 +337,7 @@ class LLMSafetyTrainer:
         
         # Add system prompt if not already present
         if not self.conversation_history or self.conversation_history[0]["role"] != "system":
-            system_prompt = """You are an AI Security Mentor helping users learn secure coding practices. 
-
-Your role is to:
-1. Analyze code for potential data leaks (API keys, PII, medical records, internal infrastructure)
-2. Explain what was detected and why it's a security risk
-3. Provide specific, actionable fixes for the identified issues
-4. Teach secure coding practices and best practices
-5. Keep responses concise, clear, and educational
-
-When analyzing code:
-- Point out specific lines or patterns that contain sensitive data
-- Explain the security risk clearly
-- Provide concrete examples of how to fix the issues
-- Focus on practical solutions
-
-Be helpful, educational, and security-focused in all responses."""
-            
-            self.conversation_history.insert(0, {"role": "system", "content": system_prompt})
+            self.conversation_history.insert(0, {"role": "system", "content": SECURITY_MENTOR_SYSTEM_PROMPT})
         
         # Generate response
         response, token_info = self.ollama_client.chat(self.conversation_history)
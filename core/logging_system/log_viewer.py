@@ -4,14 +4,183 @@ Log Viewer for Sec360 by Abhay
 Provides an isolated interface to view and analyze user session logs
 """
 
+import hashlib
 import json
 import os
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import datetime
 from typing import List, Dict, Optional
 import webbrowser
+from bisect import bisect_right
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
+from types import MappingProxyType
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Shared read-only default for missing nested dicts
+EMPTY_MAPPING = MappingProxyType({})
+
+# Tag styles for the risk calculation text, applied once at widget creation
+CALC_TEXT_STYLES = {
+    "header": ("#2c3e50", ('TkDefaultFont', 12, 'bold')),
+    "category": ("#8e44ad", ('TkDefaultFont', 11, 'bold')),
+    "calculation": ("#27ae60", ('TkDefaultFont', 11)),
+    "score": ("#e74c3c", ('TkDefaultFont', 11, 'bold')),
+    "items": ("#3498db", ('TkDefaultFont', 10)),
+    "summary": ("#f39c12", ('TkDefaultFont', 11, 'bold')),
+}
+
+# Static legend content shared by the cached image and the Text fallback
+LEGEND_BG = "#f8f9fa"
+LEGEND_MARKERS = ("🔴", "🟢", "🔵", "🟠", "🟡", "🚨")
+LEGEND_STYLES = {
+    "header": ("#2c3e50", ('TkDefaultFont', 12, 'bold')),
+    "pii": ("#cc0000", ('TkDefaultFont', 11, 'bold')),
+    "medical": ("#006600", ('TkDefaultFont', 11, 'bold')),
+    "hepa": ("#003366", ('TkDefaultFont', 11, 'bold')),
+    "api": ("#cc6600", ('TkDefaultFont', 11, 'bold')),
+    "low": ("#006600", ('TkDefaultFont', 11, 'bold')),
+    "medium": ("#b8860b", ('TkDefaultFont', 11, 'bold')),
+    "high": ("#cc0000", ('TkDefaultFont', 11, 'bold')),
+    "critical": ("#990000", ('TkDefaultFont', 11, 'bold')),
+    "formula": ("#34495e", ('TkDefaultFont', 11)),
+}
+LEGEND_ROWS = (
+    (("Risk Categories: ", "header"), ("🔴 PII ", "pii"), ("🟢 Medical ", "medical"),
+     ("🔵 HEPA ", "hepa"), ("🟠 API/Security\n", "api")),
+    (("Risk Score Details: ", "header"), ("🟢 LOW(0-29) ", "low"), ("🟡 MEDIUM(30-59) ", "medium"),
+     ("🔴 HIGH(60-79) ", "high"), ("🚨 CRITICAL(80-100)\n", "critical")),
+    (("Risk Calculation Formula: ", "header"), ("Fields×0.1 ", "formula"), ("Data×8.0 ", "formula"),
+     ("Medical(1.2x) ", "formula"), ("HEPA(1.1x) ", "formula"), ("PII(1.0x) ", "formula"),
+     ("API(0.9x)\n", "formula")),
+    (("Line Factor: ", "header"), ("min(1.0, max(0.1, lines/100))", "formula")),
+)
+
+# Per-category (key, display name, multiplier) shared by the breakdown, item scoring and calculation views
+CATEGORY_META = (
+    ('pii', 'PII Data', 1.0),
+    ('medical', 'Medical Data', 1.2),
+    ('hepa', 'HEPA Data', 1.1),
+    ('compliance_api', 'API/Security Data', 0.9),
+)
+CATEGORY_MULTIPLIERS = {key: multiplier for key, _, multiplier in CATEGORY_META}
+CATEGORY_KEYS = tuple(CATEGORY_MULTIPLIERS)
+CATEGORY_INDEX = {key: index for index, key in enumerate(CATEGORY_KEYS)}
+
+# Longest item name shown in the detailed calculation before truncation
+ITEM_NAME_MAX = 25
+
+# (format string, tag) lines for the basic risk calculation view
+BASIC_CALC_TEMPLATE = (
+    ("📊 Risk Score Analysis & Calculation:\n\n", "header"),
+    ("📈 Risk Metrics Overview:\n", "category"),
+    ("• Total Lines Analyzed: {total_lines}\n", "calculation"),
+    ("• Sensitive Fields Found: {total_fields}\n", "calculation"),
+    ("• Sensitive Data Instances: {total_data}\n", "calculation"),
+    ("• Total Risk Items: {total_items}\n", "calculation"),
+    ("• PII Count: {pii_count}\n", "calculation"),
+    ("• Medical Data: {medical_count}\n", "calculation"),
+    ("• HEPA Count: {hepa_count}\n", "calculation"),
+    ("• API/Security: {api_security_count}\n\n", "calculation"),
+)
+BASIC_BREAKDOWN_TEMPLATE = (
+    ("🧮 Risk Calculation Breakdown:\n", "category"),
+    ("• Field Risk: min(60, {total_fields} × 0.1) = {field_risk}\n", "calculation"),
+    ("• Data Risk: min(60, {total_data} × 8.0) = {data_risk}\n", "calculation"),
+    ("• Line Factor: max(0.7, min(1.0, 1.0 - (0.001 × {total_lines} / 100))) = {line_factor:.3f}\n", "calculation"),
+    ("• Base Score: ({field_risk} + {data_risk}) × {line_factor:.3f} = {base_score:.1f}\n", "calculation"),
+    ("• Category Score: {pii_count} + {medical_count} + {hepa_count} + {api_security_count} = {category_score}\n", "calculation"),
+    ("• Final Risk Score: min(100, int({base_score:.1f} + {category_score})) = {final_score}/100 ({risk_level})\n\n", "score"),
+    ("🎯 Risk Level Analysis:\n", "category"),
+    ("• Risk Level: {level} ({risk_level})\n", "score"),
+    ("• Recommendation: {recommendation}\n", "items"),
+    ("• Priority: {priority}\n", "items"),
+    ("\n💡 Note: For detailed field names and data values, use the Enhanced Log Viewer.", "items"),
+)
+BASIC_CLEAN_TEMPLATE = (
+    ("• No sensitive data detected\n", "calculation"),
+    ("• Risk Score: {avg_risk_score:.1f}/100 ({risk_level})\n", "score"),
+    ("• Status: Clean code - no security risks identified", "items"),
+)
+
+DETAILED_CALC_TEMPLATE = (
+    ("📊 Detailed Risk Calculation:\n\nSession Overview:\n", "header"),
+    ("• Total Lines: {total_lines}\n• Analyses: {analysis_count}\n", "calculation"),
+    ("• Final Score: {avg_risk_score:.1f}/100 ({risk_level})\n\n", "score"),
+    ("Category Breakdown:\n", "header"),
+)
+DETAILED_CATEGORY_TEMPLATE = (
+    ("• {display_name}:\n", "category"),
+    ("  - Fields: {fields} × 0.1 = {fields_score} points\n  - Data: {data} × 8 = {data_score} points\n", "calculation"),
+    ("  - Subtotal: {category_base} × {multiplier} = {category_score:.1f} points\n", "score"),
+)
+DETAILED_SUMMARY_TEMPLATE = (
+    ("Calculation Summary:\n", "summary"),
+    ("• Base Score: {total_base_score:.1f} points\n• Line Normalization: Applied for {total_lines} lines\n", "calculation"),
+    ("• Final Score: {avg_risk_score:.1f}/100\n• Risk Level: {risk_level}\n\n", "score"),
+    ("Multipliers: Medical (1.2x), HEPA (1.1x), PII (1.0x), API (0.9x)", "calculation"),
+)
+
+# Basic calculation weights in thousandths: Fields×0.1, Data×8.0, each capped at 60
+FIELD_RISK_MILLI = 100
+DATA_RISK_MILLI = 8000
+RISK_CAP_MILLI = 60000
+# Line factor 1.0 - (0.001 × lines / 100), floored at 0.7, scaled by 100000
+LINE_FACTOR_SCALE = 100000
+LINE_FACTOR_FLOOR = 70000
+
+# Risk level rows (level, recommendation, priority) selected by bisecting the score thresholds
+RISK_LEVEL_THRESHOLDS = (60, 70, 80)
+RISK_LEVEL_ROWS = (
+    ("LOW", "Monitor and improve", "Good security practices"),
+    ("MEDIUM", "Address security issues", "Review and remediate"),
+    ("HIGH", "Address security issues urgently", "High"),
+    ("CRITICAL", "Immediate action required", "Critical security review needed"),
+)
+
+# Detail window text for a flagged-content row
+LOG_DETAIL_TEMPLATE = "Timestamp: {}\nFlag Type: {}\nContent: {}\nConfidence: {}\nContext: {}\n"
+
+# Maximum number of rendered risk calculations kept in the LRU cache
+CALC_CACHE_SIZE = 32
+
+# Delay used to coalesce rapid session-selection events into one refresh
+SELECTION_DEBOUNCE_MS = 80
+
+# Number of flagged-item rows inserted into the log tree per event-loop slice
+LOG_INSERT_CHUNK_SIZE = 200
+
+def _load_json_file(file_path) -> Dict:
+    """Read and parse a JSON file, using orjson when it is installed"""
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+def _dump_json_file(file_path, data: Dict) -> None:
+    """Stream data as indented JSON through a buffered writer, never holding the whole output in memory"""
+    with open(file_path, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+        json.dump(data, f, indent=2, separators=(',', ': '), ensure_ascii=False, check_circular=False)
+
+def _iter_template(template, ctx: Dict):
+    """Yield alternating text/tag arguments for Text.insert from a (format string, tag) template"""
+    for fmt, tag in template:
+        yield fmt.format_map(ctx)
+        yield tag
 
 class LogViewer:
     def __init__(self):
@@ -22,6 +191,11 @@ class LogViewer:
         self.session_data = {}
         self.current_session = None
         self._initializing = True  # Flag to prevent trace callbacks during setup
+        self._pending_refresh = None  # Pending after() id for debounced selection refresh
+        self._insert_job = None  # Pending after() id for chunked log_tree fill
+        self._calc_cache = OrderedDict()  # LRU of rendered calc_text parts by session fingerprint
+        self._detail_window = None  # Reused log detail Toplevel
+        self._detail_text = None
         
         self.setup_ui()
         self.clear_session_display()  # Initialize with empty display
@@ -91,6 +265,15 @@ class LogViewer:
         v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
         
+        # Configure tag colors for flag types
+        self.log_tree.tag_configure("analysis", background="#e6f3ff", foreground="#003366")    # Light blue for analyses
+        self.log_tree.tag_configure("session", background="#f0f8ff", foreground="#4169e1")    # Light blue for session info
+        self.log_tree.tag_configure("metrics", background="#fff8dc", foreground="#b8860b")   # Light yellow for metrics
+        self.log_tree.tag_configure("pii", background="#ffe6e6", foreground="#cc0000")       # Light red for PII
+        self.log_tree.tag_configure("medical", background="#e6ffe6", foreground="#006600")   # Light green for medical
+        self.log_tree.tag_configure("hepa", background="#e6f3ff", foreground="#003366")      # Light blue for HEPA
+        self.log_tree.tag_configure("compliance_api", background="#fff0e6", foreground="#cc6600")  # Light orange for API
+        
         # Bind double-click event
         self.log_tree.bind('<Double-1>', self.on_log_double_click)
         
@@ -104,12 +287,8 @@ class LogViewer:
         self.calc_text.pack(fill=tk.BOTH, expand=True, pady=(2, 0))
         
         # Configure text tags for color coding
-        self.calc_text.tag_configure("header", foreground="#2c3e50", font=('TkDefaultFont', 12, 'bold'))
-        self.calc_text.tag_configure("category", foreground="#8e44ad", font=('TkDefaultFont', 11, 'bold'))
-        self.calc_text.tag_configure("calculation", foreground="#27ae60", font=('TkDefaultFont', 11))
-        self.calc_text.tag_configure("score", foreground="#e74c3c", font=('TkDefaultFont', 11, 'bold'))
-        self.calc_text.tag_configure("items", foreground="#3498db", font=('TkDefaultFont', 10))
-        self.calc_text.tag_configure("summary", foreground="#f39c12", font=('TkDefaultFont', 11, 'bold'))
+        for tag, (color, font) in CALC_TEXT_STYLES.items():
+            self.calc_text.tag_configure(tag, foreground=color, font=font)
         
         # Initial message
         self.calc_text.insert(tk.END, "Select a session to see detailed risk score calculation...")
@@ -119,46 +298,72 @@ class LogViewer:
         footer_frame = ttk.LabelFrame(main_frame, text="Risk Categories & Levels Legend")
         footer_frame.pack(fill=tk.X, pady=(5, 0))
         
-        # Create a simple text widget for the footer content
+        # Prefer a pre-rendered legend image; fall back to the tagged Text widget
+        legend_path = self._get_legend_image()
+        if legend_path:
+            self.legend_img = tk.PhotoImage(file=str(legend_path))
+            ttk.Label(footer_frame, image=self.legend_img).pack(fill=tk.X, padx=8, pady=8)
+        else:
+            self._build_legend_text(footer_frame)
+    
+    def _get_legend_image(self) -> Optional[Path]:
+        """Return the cached legend image, building it with PIL on first use"""
+        # The file name carries a hash of the legend content so edits rebuild the image
+        legend_key = hashlib.md5(repr((LEGEND_ROWS, LEGEND_STYLES, LEGEND_BG)).encode("utf-8")).hexdigest()[:12]
+        project_root = Path(__file__).parent.parent.parent
+        legend_path = project_root / "assets" / f"legend_{legend_key}.png"
+        if legend_path.exists():
+            return legend_path
+        if not PIL_AVAILABLE:
+            return None
+        
+        try:
+            font = ImageFont.load_default()
+            line_height = 24
+            width, height = 1160, 16 + line_height * len(LEGEND_ROWS)
+            image = Image.new("RGB", (width, height), LEGEND_BG)
+            draw = ImageDraw.Draw(image)
+            
+            y = 8
+            for row in LEGEND_ROWS:
+                x = 8
+                for text, tag in row:
+                    color = LEGEND_STYLES[tag][0]
+                    # Emoji markers are drawn as colored dots since PIL fonts lack emoji glyphs
+                    if text[:1] in LEGEND_MARKERS:
+                        draw.ellipse((x, y + 4, x + 10, y + 14), fill=color)
+                        x += 16
+                        text = text[1:].lstrip()
+                    text = text.rstrip("\n")
+                    draw.text((x, y), text, fill=color, font=font)
+                    x += int(draw.textlength(text, font=font)) + 6
+                y += line_height
+            
+            legend_path.parent.mkdir(parents=True, exist_ok=True)
+            image.save(legend_path)
+            # Remove legends rendered from older LEGEND_* content
+            for stale_path in legend_path.parent.glob("legend*.png"):
+                if stale_path != legend_path:
+                    stale_path.unlink(missing_ok=True)
+            return legend_path
+        except Exception as e:
+            print(f"Error building legend image: {e}")
+            return None
+    
+    def _build_legend_text(self, footer_frame):
+        """Build the legend as a tagged Text widget (used when PIL is unavailable)"""
         footer_text = tk.Text(footer_frame, height=8, wrap=tk.WORD, font=('TkDefaultFont', 10),
-                             bg="#f8f9fa", fg="#2c3e50", relief=tk.SUNKEN, bd=1)
+                             bg=LEGEND_BG, fg="#2c3e50", relief=tk.SUNKEN, bd=1)
         footer_text.pack(fill=tk.X, padx=8, pady=8)
         
-        # Transposed layout - each section side by side
-        footer_text.insert(tk.END, "Risk Categories: ", "header")
-        footer_text.insert(tk.END, "🔴 PII ", "pii")
-        footer_text.insert(tk.END, "🟢 Medical ", "medical")
-        footer_text.insert(tk.END, "🔵 HEPA ", "hepa")
-        footer_text.insert(tk.END, "🟠 API/Security\n", "api")
-        
-        footer_text.insert(tk.END, "Risk Score Details: ", "header")
-        footer_text.insert(tk.END, "🟢 LOW(0-29) ", "low")
-        footer_text.insert(tk.END, "🟡 MEDIUM(30-59) ", "medium")
-        footer_text.insert(tk.END, "🔴 HIGH(60-79) ", "high")
-        footer_text.insert(tk.END, "🚨 CRITICAL(80-100)\n", "critical")
-        
-        footer_text.insert(tk.END, "Risk Calculation Formula: ", "header")
-        footer_text.insert(tk.END, "Fields×0.1 ", "formula")
-        footer_text.insert(tk.END, "Data×8.0 ", "formula")
-        footer_text.insert(tk.END, "Medical(1.2x) ", "formula")
-        footer_text.insert(tk.END, "HEPA(1.1x) ", "formula")
-        footer_text.insert(tk.END, "PII(1.0x) ", "formula")
-        footer_text.insert(tk.END, "API(0.9x)\n", "formula")
-        
-        footer_text.insert(tk.END, "Line Factor: ", "header")
-        footer_text.insert(tk.END, "min(1.0, max(0.1, lines/100))", "formula")
-        
         # Configure text tags for color coding with larger fonts for better readability
-        footer_text.tag_configure("header", foreground="#2c3e50", font=('TkDefaultFont', 12, 'bold'))
-        footer_text.tag_configure("pii", foreground="#cc0000", font=('TkDefaultFont', 11, 'bold'))
-        footer_text.tag_configure("medical", foreground="#006600", font=('TkDefaultFont', 11, 'bold'))
-        footer_text.tag_configure("hepa", foreground="#003366", font=('TkDefaultFont', 11, 'bold'))
-        footer_text.tag_configure("api", foreground="#cc6600", font=('TkDefaultFont', 11, 'bold'))
-        footer_text.tag_configure("low", foreground="#006600", font=('TkDefaultFont', 11, 'bold'))
-        footer_text.tag_configure("medium", foreground="#b8860b", font=('TkDefaultFont', 11, 'bold'))
-        footer_text.tag_configure("high", foreground="#cc0000", font=('TkDefaultFont', 11, 'bold'))
-        footer_text.tag_configure("critical", foreground="#990000", font=('TkDefaultFont', 11, 'bold'))
-        footer_text.tag_configure("formula", foreground="#34495e", font=('TkDefaultFont', 11))
+        for tag, (color, font) in LEGEND_STYLES.items():
+            footer_text.tag_configure(tag, foreground=color, font=font)
+        
+        # Transposed layout - each section side by side
+        for row in LEGEND_ROWS:
+            for text, tag in row:
+                footer_text.insert(tk.END, text, tag)
         
         footer_text.config(state=tk.DISABLED)
         
@@ -166,6 +371,7 @@ class LogViewer:
     def load_sessions(self):
         """Load all available sessions from detailed_sessions folder"""
         self.session_data = {}
+        self._calc_cache.clear()
         sessions = []
         
         # Look for session files in detailed_sessions directory
@@ -178,16 +384,15 @@ class LogViewer:
                 session_id = file_path.stem.replace("_detailed", "")
                 
                 try:
-                    with open(file_path, 'r') as f:
-                        session_data = json.load(f)
-                        # Store the entire session data
-                        self.session_data[session_id] = session_data
-                        
-                        # Extract user info for display
-                        user_name = session_data.get('user_name', 'Unknown')
-                        session_start = session_data.get('session_start_time', 'Unknown')
-                        display_name = f"{session_id} ({user_name} - {session_start})"
-                        sessions.append((display_name, session_id))
+                    session_data = _load_json_file(file_path)
+                    # Store the entire session data
+                    self.session_data[session_id] = session_data
+                    
+                    # Extract user info for display
+                    user_name = session_data.get('user_name', 'Unknown')
+                    session_start = session_data.get('session_start_time', 'Unknown')
+                    display_name = f"{session_id} ({user_name} - {session_start})"
+                    sessions.append((display_name, session_id))
                 except Exception as e:
                     print(f"Error loading detailed session file {file_path}: {e}")
             
@@ -196,15 +401,14 @@ class LogViewer:
                 session_id = file_path.stem.replace("session_", "")
                 
                 try:
-                    with open(file_path, 'r') as f:
-                        session_data = json.load(f)
-                        self.session_data[session_id] = session_data
-                        
-                        user_name = session_data.get('user_name', 'Unknown')
-                        session_start = session_data.get('session_start_time', 'Unknown')
-                        display_name = f"{session_id} ({user_name} - {session_start})"
-                        sessions.append((display_name, session_id))
-                        
+                    session_data = _load_json_file(file_path)
+                    self.session_data[session_id] = session_data
+                    
+                    user_name = session_data.get('user_name', 'Unknown')
+                    session_start = session_data.get('session_start_time', 'Unknown')
+                    display_name = f"{session_id} ({user_name} - {session_start})"
+                    sessions.append((display_name, session_id))
+                    
                 except Exception as e:
                     print(f"Error loading legacy session {session_id}: {e}")
         
@@ -233,7 +437,15 @@ class LogViewer:
         self.clear_session_display()
     
     def on_session_selected(self, event=None):
-        """Handle session selection"""
+        """Handle session selection, coalescing rapid events into one refresh"""
+        self._cancel_log_fill()
+        if self._pending_refresh:
+            self.root.after_cancel(self._pending_refresh)
+        self._pending_refresh = self.root.after(SELECTION_DEBOUNCE_MS, self._do_refresh)
+    
+    def _do_refresh(self):
+        """Refresh all session displays for the currently selected session"""
+        self._pending_refresh = None
         display_name = self.session_var.get()
         
         if display_name and hasattr(self, 'session_id_mapping'):
@@ -299,15 +511,17 @@ class LogViewer:
     def _get_detailed_risk_breakdown(self, session_id: str) -> str:
         """Get detailed risk breakdown from analysis details file"""
         try:
-            # Get project root directory
-            project_root = Path(__file__).parent.parent.parent
-            details_file = project_root / "core" / "logs" / "sessions" / f"{session_id}_details.json"
-            
-            if not details_file.exists():
-                return ""  # No detailed data available
-            
-            with open(details_file, 'r', encoding='utf-8') as f:
-                details_data = json.load(f)
+            # Reuse the already-loaded session data when it carries the analyses
+            details_data = self.session_data.get(session_id) or {}
+            if 'analyses' not in details_data:
+                # Get project root directory
+                project_root = Path(__file__).parent.parent.parent
+                details_file = project_root / "core" / "logs" / "sessions" / f"{session_id}_details.json"
+                
+                if not details_file.exists():
+                    return ""  # No detailed data available
+                
+                details_data = _load_json_file(details_file)
             
             analyses = details_data.get('analyses', [])
             if not analyses:
@@ -318,13 +532,9 @@ class LogViewer:
             total_risk_score = 0
             analysis_count = 0
             
-            # Category totals
-            category_totals = {
-                'pii': {'fields': 0, 'data': 0, 'items': []},
-                'medical': {'fields': 0, 'data': 0, 'items': []},
-                'hepa': {'fields': 0, 'data': 0, 'items': []},
-                'compliance_api': {'fields': 0, 'data': 0, 'items': []}
-            }
+            # Category totals - only the names that are actually displayed are kept
+            category_totals = {k: {'fields': 0, 'data': 0, 'field_names': [], 'data_names': []}
+                               for k in CATEGORY_KEYS}
             
             for analysis in analyses:
                 analysis_details = analysis.get('analysis_details', {})
@@ -340,16 +550,15 @@ class LogViewer:
                     item_category = item.get('category', '').lower()
                     
                     if item_category in category_totals:
+                        totals = category_totals[item_category]
                         if item_type == 'sensitive_field':
-                            category_totals[item_category]['fields'] += 1
+                            totals['fields'] += 1
+                            if len(totals['field_names']) < 3:
+                                totals['field_names'].append(item_name)
                         elif item_type == 'sensitive_data':
-                            category_totals[item_category]['data'] += 1
-                        
-                        category_totals[item_category]['items'].append({
-                            'type': item_type,
-                            'name': item_name,
-                            'line': item.get('line', 0)
-                        })
+                            totals['data'] += 1
+                            if len(totals['data_names']) < 2:
+                                totals['data_names'].append(item_name)
             
             if analysis_count == 0:
                 return ""
@@ -362,52 +571,32 @@ class LogViewer:
             # Category breakdown
             breakdown += "📊 Category Contributions:\n"
             
-            category_names = {
-                'pii': 'PII Data',
-                'medical': 'Medical Data', 
-                'hepa': 'HEPA Data',
-                'compliance_api': 'API/Security Data'
-            }
-            
-            category_multipliers = {
-                'pii': 1.0,
-                'medical': 1.2,
-                'hepa': 1.1,
-                'compliance_api': 0.9
-            }
-            
-            for category, data in category_totals.items():
+            for category, display_name, multiplier in CATEGORY_META:
+                data = category_totals[category]
                 if data['fields'] > 0 or data['data'] > 0:
                     total_items = data['fields'] + data['data']
-                    multiplier = category_multipliers.get(category, 1.0)
                     base_score = total_items * 5 * multiplier
                     
-                    breakdown += f"• {category_names.get(category, category.title())} ({data['fields']} fields + {data['data']} instances): {base_score:.1f} points\n"
+                    breakdown += f"• {display_name} ({data['fields']} fields + {data['data']} instances): {base_score:.1f} points\n"
                     
                     # Show individual items
-                    if data['items']:
-                        breakdown += f"  - Fields: "
-                        fields = [item['name'] for item in data['items'] if item['type'] == 'sensitive_field']
-                        if fields:
-                            breakdown += f"{', '.join(fields[:3])}"  # Show first 3
-                            if len(fields) > 3:
-                                breakdown += f" (+{len(fields)-3} more)"
-                        breakdown += "\n"
-                        
-                        breakdown += f"  - Data: "
-                        data_items = [item['name'] for item in data['items'] if item['type'] == 'sensitive_data']
-                        if data_items:
-                            # Truncate long data values
-                            display_data = []
-                            for item in data_items[:2]:  # Show first 2
-                                if len(item) > 20:
-                                    display_data.append(item[:17] + "...")
-                                else:
-                                    display_data.append(item)
-                            breakdown += f"{', '.join(display_data)}"
-                            if len(data_items) > 2:
-                                breakdown += f" (+{len(data_items)-2} more)"
-                        breakdown += "\n"
+                    breakdown += f"  - Fields: "
+                    if data['field_names']:
+                        breakdown += f"{', '.join(data['field_names'])}"  # First 3
+                        if data['fields'] > 3:
+                            breakdown += f" (+{data['fields']-3} more)"
+                    breakdown += "\n"
+                    
+                    breakdown += f"  - Data: "
+                    if data['data_names']:
+                        # Truncate long data values (first 2 only)
+                        breakdown += ', '.join(
+                            (item[:17] + "...") if len(item) > 20 else item
+                            for item in data['data_names']
+                        )
+                        if data['data'] > 2:
+                            breakdown += f" (+{data['data']-2} more)"
+                    breakdown += "\n"
             
             breakdown += f"\n📈 Risk Calculation:\n"
             breakdown += f"• Base score: Fields × 0.1 + Data × 8\n"
@@ -423,9 +612,12 @@ class LogViewer:
     
     def display_session_logs(self):
         """Display session logs in treeview"""
-        # Clear existing items
-        for item in self.log_tree.get_children():
-            self.log_tree.delete(item)
+        self._cancel_log_fill()
+        
+        # Clear existing items in a single Tcl call
+        children = self.log_tree.get_children()
+        if children:
+            self.log_tree.delete(*children)
         
         if not self.current_session:
             return
@@ -436,81 +628,88 @@ class LogViewer:
         detailed_items = self._load_detailed_flagged_items(session_data.get('unique_session_id', self.current_session))
         
         if detailed_items:
-            # Display individual flagged items
-            for item in detailed_items:
-                timestamp = item.get('timestamp', 'Unknown')
-                item_type = item.get('type', 'Unknown')
-                item_name = item.get('name', 'Unknown')
-                category = item.get('category', 'Unknown')
-                line = item.get('line', 0)
+            # Insert the first chunk now and fill the rest from the event loop
+            rows = (self._build_log_row(item) for item in detailed_items)
+            self._insert_log_rows(rows)
+    
+    def _build_log_row(self, item: Dict):
+        """Build the treeview values and tags for a flagged item"""
+        timestamp = item.get('timestamp', 'Unknown')
+        item_type = item.get('type', 'Unknown')
+        item_name = item.get('name', 'Unknown')
+        category = item.get('category', 'Unknown')
+        line = item.get('line', 0)
+        
+        # Calculate risk score for this item
+        risk_score = self._calculate_item_risk_score(item)
+        
+        # Format display
+        if item_type == 'sensitive_field':
+            content = f"Field: {item_name}"
+            flag_type = f"{category}_FIELD"
+        elif item_type == 'sensitive_data':
+            # Truncate long data values
+            display_name = item_name[:30] + "..." if len(item_name) > 30 else item_name
+            content = f"Data: {display_name}"
+            flag_type = f"{category}_DATA"
+        else:
+            content = f"{item_type}: {item_name}"
+            flag_type = category
+        
+        context = f"Line {line}" if line > 0 else "Unknown line"
+        
+        values = (timestamp, flag_type, content, f"{risk_score:.1f}", context)
+        return values, [category.lower()]
+    
+    def _insert_log_rows(self, rows):
+        """Insert one chunk of rows and reschedule until the iterator is exhausted"""
+        self._insert_job = None
+        inserted = 0
+        for values, tags in islice(rows, LOG_INSERT_CHUNK_SIZE):
+            self.log_tree.insert('', tk.END, values=values, tags=tags)
+            inserted += 1
+        
+        if inserted == LOG_INSERT_CHUNK_SIZE:
+            self._insert_job = self.root.after(1, self._insert_log_rows, rows)
+    
+    def _cancel_log_fill(self):
+        """Abandon any in-progress chunked treeview fill"""
+        if self._insert_job:
+            self.root.after_cancel(self._insert_job)
+            self._insert_job = None
+    
+    def _load_detailed_flagged_items(self, session_id: str) -> List[Dict]:
+        """Load detailed flagged items from detailed sessions"""
+        try:
+            # load_sessions already parsed the detailed file - reuse it
+            session_data = self.session_data.get(session_id)
+            
+            if not session_data or 'current_analysis' not in session_data:
+                # Legacy session without analysis data - fall back to disk
+                print(f"DEBUG: Looking for detailed session file for session_id: {session_id}")
                 
-                # Calculate risk score for this item
-                risk_score = self._calculate_item_risk_score(item)
+                # Get project root directory
+                project_root = Path(__file__).parent.parent.parent
+                detailed_sessions_dir = project_root / "detailed_sessions"
                 
-                # Format display
-                if item_type == 'sensitive_field':
-                    content = f"Field: {item_name}"
-                    flag_type = f"{category}_FIELD"
-                elif item_type == 'sensitive_data':
-                    # Truncate long data values
-                    display_name = item_name[:30] + "..." if len(item_name) > 30 else item_name
-                    content = f"Data: {display_name}"
-                    flag_type = f"{category}_DATA"
-                else:
-                    content = f"{item_type}: {item_name}"
-                    flag_type = category
+                print(f"DEBUG: Detailed sessions directory: {detailed_sessions_dir}")
                 
-                context = f"Line {line}" if line > 0 else "Unknown line"
+                if not detailed_sessions_dir.exists():
+                    print("DEBUG: Detailed sessions directory does not exist")
+                    return []
                 
-                self.log_tree.insert('', tk.END, values=(
-                    timestamp,
-                    flag_type,
-                    content,
-                    f"{risk_score:.1f}",
-                    context
-                ), tags=[category.lower()])
+                # Look for detailed session file
+                detailed_file = detailed_sessions_dir / f"{session_id}_detailed.json"
                 
-                # Configure tag colors for new types
-                self.log_tree.tag_configure("analysis", background="#e6f3ff", foreground="#003366")    # Light blue for analyses
-                self.log_tree.tag_configure("session", background="#f0f8ff", foreground="#4169e1")    # Light blue for session info
-                self.log_tree.tag_configure("metrics", background="#fff8dc", foreground="#b8860b")   # Light yellow for metrics
-                self.log_tree.tag_configure("pii", background="#ffe6e6", foreground="#cc0000")       # Light red for PII
-                self.log_tree.tag_configure("medical", background="#e6ffe6", foreground="#006600")   # Light green for medical
-                self.log_tree.tag_configure("hepa", background="#e6f3ff", foreground="#003366")      # Light blue for HEPA
-                self.log_tree.tag_configure("compliance_api", background="#fff0e6", foreground="#cc6600")  # Light orange for API
+                print(f"DEBUG: Looking for file: {detailed_file}")
                 
-                # Refresh the tree to ensure items are visible
-                self.log_tree.update()
-    
-    def _load_detailed_flagged_items(self, session_id: str) -> List[Dict]:
-        """Load detailed flagged items from detailed sessions"""
-        try:
-            # Debug logging
-            print(f"DEBUG: Looking for detailed session file for session_id: {session_id}")
-            
-            # Get project root directory
-            project_root = Path(__file__).parent.parent.parent
-            detailed_sessions_dir = project_root / "detailed_sessions"
-            
-            print(f"DEBUG: Detailed sessions directory: {detailed_sessions_dir}")
-            
-            if not detailed_sessions_dir.exists():
-                print("DEBUG: Detailed sessions directory does not exist")
-                return []
-            
-            # Look for detailed session file
-            detailed_file = detailed_sessions_dir / f"{session_id}_detailed.json"
-            
-            print(f"DEBUG: Looking for file: {detailed_file}")
-            
-            if not detailed_file.exists():
-                print("DEBUG: Detailed session file does not exist")
-                return []
-            
-            print("DEBUG: Detailed session file found, loading...")
-            
-            with open(detailed_file, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
+                if not detailed_file.exists():
+                    print("DEBUG: Detailed session file does not exist")
+                    return []
+                
+                print("DEBUG: Detailed session file found, loading...")
+                
+                session_data = _load_json_file(detailed_file)
             
             # Get flagged items from the detailed session data
             flagged_items = []
@@ -582,15 +781,7 @@ class LogViewer:
             else:
                 base_score = 3.0
             
-            # Category multipliers
-            category_multipliers = {
-                'pii': 1.0,
-                'medical': 1.2,
-                'hepa': 1.1,
-                'compliance_api': 0.9
-            }
-            
-            multiplier = category_multipliers.get(category, 1.0)
+            multiplier = CATEGORY_MULTIPLIERS.get(category, 1.0)
             risk_score = base_score * multiplier
             
             # Cap at reasonable individual item score
@@ -604,10 +795,9 @@ class LogViewer:
         """Update the risk calculation display for the selected session"""
         try:
             if not self.current_session:
-                self.calc_text.config(state=tk.NORMAL)
-                self.calc_text.delete(1.0, tk.END)
-                self.calc_text.insert(tk.END, "Select a session to see detailed risk score calculation...")
-                self.calc_text.config(state=tk.DISABLED)
+                calc_text = self.calc_text
+                with self._bulk_text_update(calc_text):
+                    calc_text.insert(tk.END, "Select a session to see detailed risk score calculation...")
                 return
             
             session_data = self.session_data[self.current_session]
@@ -625,210 +815,194 @@ class LogViewer:
             
         except Exception as e:
             print(f"Error updating risk calculation: {e}")
-            self.calc_text.config(state=tk.NORMAL)
-            self.calc_text.delete(1.0, tk.END)
-            self.calc_text.insert(tk.END, f"Error calculating risk score: {str(e)}")
-            self.calc_text.config(state=tk.DISABLED)
+            calc_text = self.calc_text
+            with self._bulk_text_update(calc_text):
+                calc_text.insert(tk.END, f"Error calculating risk score: {str(e)}")
+    
+    def _render_calc_parts(self, key, build, *args):
+        """Insert the (text, tag) parts cached under key into calc_text, building them on a miss"""
+        cache = self._calc_cache
+        parts = cache.get(key)
+        if parts is None:
+            parts = build(*args)
+            cache[key] = parts
+            if len(cache) > CALC_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        
+        calc_text = self.calc_text
+        with self._bulk_text_update(calc_text):
+            calc_text.insert(tk.END, *parts)
     
     def _show_basic_risk_calculation(self, session_data):
         """Show basic risk calculation from detailed session data"""
-        self.calc_text.config(state=tk.NORMAL)
-        self.calc_text.delete(1.0, tk.END)
-        
+        key = (self.current_session, 'basic', session_data.get('risk_score'))
+        self._render_calc_parts(key, self._build_basic_calc_parts, session_data)
+    
+    def _build_basic_calc_parts(self, session_data) -> List:
+        """Build the basic risk calculation as alternating text/tag parts"""
         # Get metrics from detailed session data structure
-        current_analysis = session_data.get('current_analysis', {})
-        total_lines = current_analysis.get('lines_of_code', 0)
-        total_fields = current_analysis.get('sensitive_fields', {}).get('count', 0)
-        total_data = current_analysis.get('sensitive_data', {}).get('count', 0)
-        avg_risk_score = current_analysis.get('risk_score', 0)
-        risk_level = current_analysis.get('risk_level', 'Unknown')
+        ca_get = session_data.get('current_analysis', EMPTY_MAPPING).get
+        
+        def count(key):
+            return ca_get(key, EMPTY_MAPPING).get('count', 0)
+        
+        total_lines = ca_get('lines_of_code', 0)
+        total_fields = count('sensitive_fields')
+        total_data = count('sensitive_data')
+        avg_risk_score = ca_get('risk_score', 0)
+        risk_level = ca_get('risk_level', 'Unknown')
         
         # Get category counts
-        pii_count = current_analysis.get('pii', {}).get('count', 0)
-        medical_count = current_analysis.get('medical', {}).get('count', 0)
-        hepa_count = current_analysis.get('hepa', {}).get('count', 0)
-        api_security_count = current_analysis.get('api_security', {}).get('count', 0)
-        
-        self.calc_text.insert(tk.END, "📊 Risk Score Analysis & Calculation:\n\n", "header")
-        
-        # Risk metrics overview
-        self.calc_text.insert(tk.END, "📈 Risk Metrics Overview:\n", "category")
-        self.calc_text.insert(tk.END, f"• Total Lines Analyzed: {total_lines}\n", "calculation")
-        self.calc_text.insert(tk.END, f"• Sensitive Fields Found: {total_fields}\n", "calculation")
-        self.calc_text.insert(tk.END, f"• Sensitive Data Instances: {total_data}\n", "calculation")
-        self.calc_text.insert(tk.END, f"• Total Risk Items: {total_fields + total_data}\n", "calculation")
-        self.calc_text.insert(tk.END, f"• PII Count: {pii_count}\n", "calculation")
-        self.calc_text.insert(tk.END, f"• Medical Data: {medical_count}\n", "calculation")
-        self.calc_text.insert(tk.END, f"• HEPA Count: {hepa_count}\n", "calculation")
-        self.calc_text.insert(tk.END, f"• API/Security: {api_security_count}\n\n", "calculation")
+        pii_count = count('pii')
+        medical_count = count('medical')
+        hepa_count = count('hepa')
+        api_security_count = count('api_security')
+        
+        ctx = {
+            'total_lines': total_lines,
+            'total_fields': total_fields,
+            'total_data': total_data,
+            'total_items': total_fields + total_data,
+            'pii_count': pii_count,
+            'medical_count': medical_count,
+            'hepa_count': hepa_count,
+            'api_security_count': api_security_count,
+            'avg_risk_score': avg_risk_score,
+            'risk_level': risk_level.upper(),
+        }
         
         if total_fields + total_data > 0:
-            # Detailed risk calculation
-            self.calc_text.insert(tk.END, "🧮 Risk Calculation Breakdown:\n", "category")
-            
-            # Field risk calculation
-            field_risk = min(60, total_fields * 0.1)
-            self.calc_text.insert(tk.END, f"• Field Risk: min(60, {total_fields} × 0.1) = {field_risk}\n", "calculation")
-            
-            # Data risk calculation
-            data_risk = min(60, total_data * 8.0)
-            self.calc_text.insert(tk.END, f"• Data Risk: min(60, {total_data} × 8.0) = {data_risk}\n", "calculation")
-            
-            # Line factor calculation
-            line_factor = max(0.7, min(1.0, 1.0 - (0.001 * total_lines / 100)))
-            self.calc_text.insert(tk.END, f"• Line Factor: max(0.7, min(1.0, 1.0 - (0.001 × {total_lines} / 100))) = {line_factor:.3f}\n", "calculation")
-            
-            # Base score calculation
-            base_score = (field_risk + data_risk) * line_factor
-            self.calc_text.insert(tk.END, f"• Base Score: ({field_risk} + {data_risk}) × {line_factor:.3f} = {base_score:.1f}\n", "calculation")
-            
-            # Category score calculation
+            # Detailed risk calculation in scaled integers; floats are produced only for display
+            field_risk_milli = min(RISK_CAP_MILLI, total_fields * FIELD_RISK_MILLI)
+            data_risk_milli = min(RISK_CAP_MILLI, total_data * DATA_RISK_MILLI)
+            line_factor_scaled = max(LINE_FACTOR_FLOOR, min(LINE_FACTOR_SCALE, LINE_FACTOR_SCALE - total_lines))
+            base_score = (field_risk_milli + data_risk_milli) * line_factor_scaled / (1000 * LINE_FACTOR_SCALE)
+            # The cap stays an int so it reads as 60 like the original min(60, ...) did
+            field_risk = RISK_CAP_MILLI // 1000 if field_risk_milli == RISK_CAP_MILLI else field_risk_milli / 1000
+            data_risk = RISK_CAP_MILLI // 1000 if data_risk_milli == RISK_CAP_MILLI else data_risk_milli / 1000
+            line_factor = line_factor_scaled / LINE_FACTOR_SCALE
             category_score = pii_count + medical_count + hepa_count + api_security_count
-            self.calc_text.insert(tk.END, f"• Category Score: {pii_count} + {medical_count} + {hepa_count} + {api_security_count} = {category_score}\n", "calculation")
-            
-            # Final risk score
             final_score = min(100, int(base_score + category_score))
-            self.calc_text.insert(tk.END, f"• Final Risk Score: min(100, int({base_score:.1f} + {category_score})) = {final_score}/100 ({risk_level.upper()})\n\n", "score")
             
-            # Risk level analysis (aligned with RiskCalculator thresholds)
-            self.calc_text.insert(tk.END, "🎯 Risk Level Analysis:\n", "category")
-
-            # Determine risk level using the same logic as RiskCalculator
+            # Determine risk level using the same thresholds as RiskCalculator
             # This avoids importing the whole class for one method
-            if avg_risk_score >= 80:
-                level, recommendation, priority = "CRITICAL", "Immediate action required", "Critical security review needed"
-            elif avg_risk_score >= 70:
-                level, recommendation, priority = "HIGH", "Address security issues urgently", "High"
-            elif avg_risk_score >= 60:
-                level, recommendation, priority = "MEDIUM", "Address security issues", "Review and remediate"
-            else:
-                level, recommendation, priority = "LOW", "Monitor and improve", "Good security practices"
-
-            self.calc_text.insert(tk.END, f"• Risk Level: {level} ({risk_level.upper()})\n", "score")
-            self.calc_text.insert(tk.END, f"• Recommendation: {recommendation}\n", "items")
-            self.calc_text.insert(tk.END, f"• Priority: {priority}\n", "items")
+            level, recommendation, priority = RISK_LEVEL_ROWS[bisect_right(RISK_LEVEL_THRESHOLDS, avg_risk_score)]
             
-            self.calc_text.insert(tk.END, f"\n💡 Note: For detailed field names and data values, use the Enhanced Log Viewer.", "items")
+            ctx.update(field_risk=field_risk, data_risk=data_risk, line_factor=line_factor,
+                       base_score=base_score, category_score=category_score, final_score=final_score,
+                       level=level, recommendation=recommendation, priority=priority)
+            template = BASIC_CALC_TEMPLATE + BASIC_BREAKDOWN_TEMPLATE
         else:
-            self.calc_text.insert(tk.END, f"• No sensitive data detected\n", "calculation")
-            self.calc_text.insert(tk.END, f"• Risk Score: {avg_risk_score:.1f}/100 ({risk_level.upper()})\n", "score")
-            self.calc_text.insert(tk.END, f"• Status: Clean code - no security risks identified", "items")
-        self.calc_text.config(state=tk.DISABLED)
+            template = BASIC_CALC_TEMPLATE + BASIC_CLEAN_TEMPLATE
+        
+        # Collect (text, tag) pairs to be emitted in a single insert call
+        return list(_iter_template(template, ctx))
     
     def _show_detailed_risk_calculation(self, detailed_items, session_data):
         """Show detailed risk calculation from flagged items"""
-        self.calc_text.config(state=tk.NORMAL)
-        self.calc_text.delete(1.0, tk.END)
-        
-        # Aggregate data by category
-        category_data = {
-            'pii': {'fields': 0, 'data': 0, 'items': []},
-            'medical': {'fields': 0, 'data': 0, 'items': []},
-            'hepa': {'fields': 0, 'data': 0, 'items': []},
-            'compliance_api': {'fields': 0, 'data': 0, 'items': []}
-        }
+        key = (self.current_session, 'detailed', session_data.get('risk_score'), len(detailed_items))
+        self._render_calc_parts(key, self._build_detailed_calc_parts, detailed_items, session_data)
+    
+    def _build_detailed_calc_parts(self, detailed_items, session_data) -> List:
+        """Build the detailed risk calculation as alternating text/tag parts"""
+        # Collect (text, tag) pairs to be emitted in a single insert call
+        parts = []
+        add = parts.extend
         
-        total_risk_score = 0
-        analysis_count = 0
+        # Aggregate data by category in a single pass, into lists aligned with CATEGORY_META
+        field_counts = [0] * len(CATEGORY_META)
+        data_counts = [0] * len(CATEGORY_META)
+        item_names = [[] for _ in CATEGORY_META]
         
         for item in detailed_items:
-            item_type = item.get('type', '')
-            item_name = item.get('name', '')
-            item_category = item.get('category', '').lower()
+            get = item.get
+            index = CATEGORY_INDEX.get(get('category', '').lower())
             
-            if item_category in category_data:
+            if index is not None:
+                item_type = get('type', '')
                 if item_type == 'sensitive_field':
-                    category_data[item_category]['fields'] += 1
+                    field_counts[index] += 1
                 elif item_type == 'sensitive_data':
-                    category_data[item_category]['data'] += 1
+                    data_counts[index] += 1
                 
-                category_data[item_category]['items'].append({
-                    'type': item_type,
-                    'name': item_name,
-                    'line': item.get('line', 0)
-                })
-            
-            total_risk_score += item.get('analysis_risk_score', 0)
-            analysis_count += 1
+                item_names[index].append(get('name', ''))
         
-        # Get session metrics - try both locations
-        final_metrics = session_data.get('final_analysis_metrics', {})
-        if not final_metrics:
-            # If final_analysis_metrics is empty, try reading from root level
-            final_metrics = {
-                'total_lines': session_data.get('code_length', 0),
-                'average_risk_score': session_data.get('risk_score', 0),
-                'risk_level': session_data.get('risk_level', 'Unknown'),
-                'total_analyses': session_data.get('current_analysis', {}).get('total_analyses', 0)
-            }
-        
-        avg_risk_score = final_metrics.get('average_risk_score', 0)
-        risk_level = final_metrics.get('risk_level', 'Unknown')
-        total_lines = final_metrics.get('total_lines', 0)
+        analysis_count = len(detailed_items)
         
-        # Build calculation text with color coding
-        self.calc_text.insert(tk.END, "📊 Detailed Risk Calculation:\n\n", "header")
-        self.calc_text.insert(tk.END, "Session Overview:\n", "header")
-        self.calc_text.insert(tk.END, f"• Total Lines: {total_lines}\n", "calculation")
-        self.calc_text.insert(tk.END, f"• Analyses: {analysis_count}\n", "calculation")
-        self.calc_text.insert(tk.END, f"• Final Score: {avg_risk_score:.1f}/100 ({risk_level.upper()})\n\n", "score")
-        
-        self.calc_text.insert(tk.END, "Category Breakdown:\n", "header")
-        
-        category_names = {
-            'pii': 'PII Data',
-            'medical': 'Medical Data',
-            'hepa': 'HEPA Data',
-            'compliance_api': 'API/Security Data'
+        # Get session metrics - try both locations
+        final_metrics = session_data.get('final_analysis_metrics')
+        if final_metrics:
+            avg_risk_score = final_metrics.get('average_risk_score', 0)
+            risk_level = final_metrics.get('risk_level', 'Unknown')
+            total_lines = final_metrics.get('total_lines', 0)
+        else:
+            # If final_analysis_metrics is empty, read from root level
+            avg_risk_score = session_data.get('risk_score', 0)
+            risk_level = session_data.get('risk_level', 'Unknown')
+            total_lines = session_data.get('code_length', 0)
+        
+        ctx = {
+            'total_lines': total_lines,
+            'analysis_count': analysis_count,
+            'avg_risk_score': avg_risk_score,
+            'risk_level': risk_level.upper(),
         }
         
-        category_multipliers = {
-            'pii': 1.0,
-            'medical': 1.2,
-            'hepa': 1.1,
-            'compliance_api': 0.9
-        }
+        # Build calculation text with color coding
+        add(_iter_template(DETAILED_CALC_TEMPLATE, ctx))
         
         total_base_score = 0
         
-        for category, data in category_data.items():
-            if data['fields'] > 0 or data['data'] > 0:
-                fields_score = data['fields'] * 0.1
-                data_score = data['data'] * 8
+        for index, (category, display_name, multiplier) in enumerate(CATEGORY_META):
+            fields = field_counts[index]
+            data = data_counts[index]
+            if fields > 0 or data > 0:
+                fields_score = fields * 0.1
+                data_score = data * 8
                 category_base = fields_score + data_score
-                multiplier = category_multipliers.get(category, 1.0)
                 category_score = category_base * multiplier
                 total_base_score += category_score
                 
-                self.calc_text.insert(tk.END, f"• {category_names.get(category, category.title())}:\n", "category")
-                self.calc_text.insert(tk.END, f"  - Fields: {data['fields']} × 0.1 = {fields_score} points\n", "calculation")
-                self.calc_text.insert(tk.END, f"  - Data: {data['data']} × 8 = {data_score} points\n", "calculation")
-                self.calc_text.insert(tk.END, f"  - Subtotal: {category_base} × {multiplier} = {category_score:.1f} points\n", "score")
+                add(_iter_template(DETAILED_CATEGORY_TEMPLATE, {
+                    'display_name': display_name,
+                    'fields': fields,
+                    'fields_score': fields_score,
+                    'data': data,
+                    'data_score': data_score,
+                    'category_base': category_base,
+                    'multiplier': multiplier,
+                    'category_score': category_score,
+                }))
                 
                 # Show specific items
-                if data['items']:
-                    self.calc_text.insert(tk.END, f"  - Items: ", "calculation")
-                    # Show ALL items, not just first 3
-                    item_names = []
-                    for item in data['items']:
-                        item_name = item.get('name', 'Unknown')
-                        # Truncate very long names but show more than 15 chars
-                        if len(item_name) > 25:
-                            item_name = item_name[:25] + "..."
-                        item_names.append(item_name)
-                    
-                    self.calc_text.insert(tk.END, f"{', '.join(item_names)}", "items")
-                    self.calc_text.insert(tk.END, f" ({len(data['items'])} total)", "items")
-                    self.calc_text.insert(tk.END, "\n")
-                self.calc_text.insert(tk.END, "\n")
-        
-        self.calc_text.insert(tk.END, f"Calculation Summary:\n", "summary")
-        self.calc_text.insert(tk.END, f"• Base Score: {total_base_score:.1f} points\n", "calculation")
-        self.calc_text.insert(tk.END, f"• Line Normalization: Applied for {total_lines} lines\n", "calculation")
-        self.calc_text.insert(tk.END, f"• Final Score: {avg_risk_score:.1f}/100\n", "score")
-        self.calc_text.insert(tk.END, f"• Risk Level: {risk_level.upper()}\n\n", "score")
-        self.calc_text.insert(tk.END, f"Multipliers: Medical (1.2x), HEPA (1.1x), PII (1.0x), API (0.9x)", "calculation")
-        self.calc_text.config(state=tk.DISABLED)
+                names = item_names[index]
+                if names:
+                    add((f"  - Items: ", "calculation"))
+                    # Show ALL items, not just first 3, truncating very long names
+                    add((', '.join(
+                        (name[:ITEM_NAME_MAX] + "...") if len(name) > ITEM_NAME_MAX else name
+                        for name in names
+                    ), "items"))
+                    add((f" ({len(names)} total)", "items"))
+                    add(("\n", ""))
+                add(("\n", ""))
+        
+        ctx['total_base_score'] = total_base_score
+        add(_iter_template(DETAILED_SUMMARY_TEMPLATE, ctx))
+        return parts
+    
+    @contextmanager
+    def _bulk_text_update(self, widget):
+        """Rewrite a read-only Text widget with undo separators off and a single layout pass"""
+        widget.config(state=tk.NORMAL, autoseparators=False)
+        try:
+            widget.delete(1.0, tk.END)
+            yield widget
+        finally:
+            widget.config(state=tk.DISABLED, autoseparators=True)
+            widget.update_idletasks()
     
     def display_session_stats(self):
         """Display session statistics"""
@@ -847,8 +1021,10 @@ class LogViewer:
         
         # Clear log tree
         if hasattr(self, 'log_tree'):
-            for item in self.log_tree.get_children():
-                self.log_tree.delete(item)
+            self._cancel_log_fill()
+            children = self.log_tree.get_children()
+            if children:
+                self.log_tree.delete(*children)
         
     
     def on_log_double_click(self, event):
@@ -858,22 +1034,23 @@ class LogViewer:
             item = self.log_tree.item(selection[0])
             values = item['values']
             
-            # Create detailed view window
-            detail_window = tk.Toplevel(self.root)
-            detail_window.title("Log Detail")
-            detail_window.geometry("600x400")
-            
-            detail_text = tk.Text(detail_window, wrap=tk.WORD)
-            detail_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-            
-            detail_info = f"Timestamp: {values[0]}\n"
-            detail_info += f"Flag Type: {values[1]}\n"
-            detail_info += f"Content: {values[2]}\n"
-            detail_info += f"Confidence: {values[3]}\n"
-            detail_info += f"Context: {values[4]}\n"
+            # Create the detail window once; closing it only hides it for reuse
+            if self._detail_window is None:
+                self._detail_window = tk.Toplevel(self.root)
+                self._detail_window.withdraw()
+                self._detail_window.title("Log Detail")
+                self._detail_window.geometry("600x400")
+                self._detail_window.protocol("WM_DELETE_WINDOW", self._detail_window.withdraw)
+                
+                self._detail_text = tk.Text(self._detail_window, wrap=tk.WORD)
+                self._detail_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
             
-            detail_text.insert(tk.END, detail_info)
-            detail_text.config(state=tk.DISABLED)
+            # Fill the content while hidden, then show the window
+            self._detail_window.withdraw()
+            with self._bulk_text_update(self._detail_text):
+                self._detail_text.insert(tk.END, LOG_DETAIL_TEMPLATE.format(*values[:5]))
+            self._detail_window.deiconify()
+            self._detail_window.lift()
     
     def export_session(self):
         """Export current session to file"""
@@ -888,12 +1065,18 @@ class LogViewer:
         )
         
         if filename:
-            try:
-                with open(filename, 'w') as f:
-                    json.dump(self.session_data[self.current_session], f, indent=2)
-                messagebox.showinfo("Success", f"Session exported to {filename}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to export session: {e}")
+            # Write from a worker thread so large sessions don't freeze the UI
+            snapshot = dict(self.session_data[self.current_session])
+            threading.Thread(target=self._export_worker, args=(filename, snapshot), daemon=True).start()
+    
+    def _export_worker(self, filename, session_data: Dict):
+        """Write an exported session and report the result back on the UI thread"""
+        try:
+            _dump_json_file(filename, session_data)
+            self.root.after(0, lambda: messagebox.showinfo("Success", f"Session exported to {filename}"))
+        except Exception as e:
+            error = str(e)
+            self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to export session: {error}"))
     
     def run(self):
         """Start the log viewer"""
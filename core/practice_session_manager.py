@@ -6,13 +6,352 @@ Handles practice session functionality with comprehensive tracking and analysis.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+import atexit
+import hashlib
 import json
 import os
+import queue
+import re
 import time
 import threading
-from typing import Dict, List, Optional
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Line prefixes that mark a line as indented code
+INDENT_PREFIXES = ('    ', '\t')
+
+# Delay (seconds) used to coalesce bursts of active-session saves into one write
+ACTIVE_SESSIONS_SAVE_DELAY = 0.5
+
+# Most distinct code hashes remembered per session for duplicate detection (LRU)
+MAX_UNIQUE_CODE_HASHES = 10000
+
+# Most conversation entries kept per session; the oldest are dropped first
+MAX_CONVERSATION_ENTRIES = 5000
+
+# Chat display lines allowed before the oldest are trimmed, and lines kept after a trim
+MAX_CHAT_DISPLAY_LINES = 5000
+CHAT_DISPLAY_TRIM_LINES = 4000
+
+# Most code analysis results kept for reuse on identical submissions (LRU)
+ANALYSIS_CACHE_SIZE = 128
+
+# Characters read from the head of a session file when looking up its start time
+SESSION_FILE_HEAD_SIZE = 512
+SESSION_START_EPOCH_PATTERN = re.compile(r'"session_start_epoch"\s*:\s*(\d+)\s*[,}]')
+SESSION_START_TIME_PATTERN = re.compile(r'"session_start_time"\s*:\s*"([^"]+)"')
+
+# Write buffer size for JSON files written with the standard json module
+JSON_WRITE_BUFFER = 64 * 1024
+
+# Security Mentor system prompt for practice chat, split around the user message
+MENTOR_PROMPT_PREFIX = """You are a helpful Security Mentor focused on preventing users from sharing sensitive data with LLMs.
+
+**PRIMARY GOAL: Help users sanitize sensitive data before sharing with AI tools.**
+
+When helping users practice secure coding, suggest these specific patterns:
+
+1. **Replace sensitive field names** with generic alternatives:
+   Original: "patient_id", "ssn", "diagnosis" 
+   Secure: "user_id", "id_number", "condition"
+
+2. **Use specific generic placeholders** instead of "placeholder_value":
+   Good patterns: "value_001", "item_a", "standard_config", "default_type"
+   Avoid: "placeholder_value" (too generic)
+
+3. **Replace empty sensitive data** with defaults:
+   Original: "", ""
+   Secure: "standard_value", "default_option"
+
+4. **Environment variables for secrets**:
+   Original: password = "secret123"
+   Secure: password = os.getenv("PASSWORD", "config_value")
+
+Focus responses on:
+- Specifically preventing sensitive data sharing with LLMs
+- Using the exact placeholder patterns shown above
+- Explaining WHY sanitization protects privacy
+- Brief, actionable advice
+
+Keep examples focused on removing sensitive patterns from code.
+
+User: """
+MENTOR_PROMPT_SUFFIX = "\n\nAssistant:"
+
+# System prompt for chat security analysis, followed directly by the user message
+ANALYSIS_PROMPT_PREFIX = """You are an AI Security Mentor. Analyze the user's message for potential security issues, sensitive data exposure, or security best practices. Provide helpful guidance and recommendations.
+
+Focus on:
+- Sensitive data exposure (passwords, API keys, personal info)
+- Security vulnerabilities
+- Best practices
+- Compliance concerns (HIPAA, PCI-DSS, etc.)
+
+Be educational and helpful, not just critical.
+
+User message: """
+
+# Patterns for different types of sensitive data values, each capturing the value.
+# They are run over the whole code buffer, so every class stops at a newline to
+# keep matches within a single line.
+SENSITIVE_VALUE_PATTERNS = [
+    (category, re.compile(pattern, re.IGNORECASE))
+    for category, pattern in (
+        ('pii', r'(?:ssn|social_security|date_of_birth|birth_date|phone|email|address|full_name|first_name|last_name)[^\S\n]*[:=][^\S\n]*["\']([^"\'\n]+)["\']'),
+        ('pii', r'["\']([0-9]{3}-[0-9]{2}-[0-9]{4})["\']'),  # SSN pattern
+        ('pii', r'["\']([0-9]{2}/[0-9]{2}/[0-9]{4})["\']'),  # Date pattern
+        ('pii', r'["\'](\([0-9]{3}\)[^\S\n]*[0-9]{3}-[0-9]{4})["\']'),  # Phone pattern
+        ('medical', r'(?:patient_id|medical_record|diagnosis|medication|allergy|blood_type|prescription|lab_result|medical_data)[^\S\n]*[:=][^\S\n]*["\']([^"\'\n]+)["\']'),
+        ('medical', r'["\'](PAT-[0-9]+)["\']'),  # Patient ID pattern
+        ('medical', r'["\'](MR-[0-9]+)["\']'),   # Medical record pattern
+        ('medical', r'["\'](RX-[0-9]+)["\']'),   # Prescription pattern
+        ('api_security', r'(?:api_key|secret_key|password|token|auth|credential|private_key|encryption_key)[^\S\n]*[:=][^\S\n]*["\']([^"\'\n]+)["\']'),
+        ('api_security', r'["\'](sk-[a-zA-Z0-9]+)["\']'),  # API key pattern
+        ('api_security', r'["\'](Bearer[^\S\n]+[a-zA-Z0-9]+)["\']'),  # Bearer token pattern
+        ('api_security', r'["\'](-----BEGIN[^\S\n]+PRIVATE[^\S\n]+KEY-----[^"\n]+)["\']'),  # Private key pattern
+    )
+]
+
+# Sensitive field names, matched case-insensitively anywhere in a line
+SENSITIVE_FIELD_PATTERN = re.compile(
+    r'(?:patient_id|ssn|api_key|secret_key|password|token|email|phone|address|full_name|date_of_birth|diagnosis|medication|allergy|blood_type)',
+    re.IGNORECASE
+)
+
+# Variable name on the left of an assignment or key/value separator
+VARIABLE_NAME_PATTERN = re.compile(r'(\w+)\s*[:=]')
+
+# Things the AI mistakes for data but aren't, like f-string fragments or placeholders
+FALSE_POSITIVE_PATTERNS = (
+    re.compile(r'f["\']Bearer\s*\{.*?\}["\']'), # f-string "Bearer {token}"
+    re.compile(r'["\']\s*{.*}\s*["\']'),       # Quoted curly braces "{}" - CORRECTED
+    re.compile(r'["\']0\.0\.0\.0["\']'),          # Placeholder IPs
+    re.compile(r'["\']127\.0\.0\.1["\']'),        # Localhost
+)
+
+# AI message line classification: code-like lines (a code fence, def/return, an
+# assignment, key or secret names) and security tips, checked in that order.
+# Every tip phrase ends in ':', so lines without one skip the tip search.
+# Case folding is ASCII-only to match str.lower(), which does not fold 'ſ' to 's'.
+CODE_LINE_PATTERN = re.compile(r"```|def |return |_key|^password|^TOKEN|^[^=].*=|(?ai:secret)")
+SECURITY_TIP_PATTERN = re.compile(r"tip:|recommendation:|best practice:", re.IGNORECASE | re.ASCII)
+
+# Static blocks of the secure coding suggestions message
+SUGGESTIONS_HEADER = "🔒 SECURE CODING SUGGESTIONS:\n\n"
+API_SECRETS_SUGGESTION = (
+    "API Keys & Secrets:\n"
+    "❌ Vulnerable: api_key = \"sk-1234567890abcdef\"\n"
+    "✅ Secure: api_key = os.getenv(\"API_KEY\", \"placeholder_value\")\n\n"
+)
+PERSONAL_INFO_SUGGESTION = (
+    "Personal Information:\n"
+    "❌ Vulnerable: user_email = \"john.doe@example.com\"\n"
+    "✅ Secure: user_email = os.getenv(\"USER_EMAIL\", \"placeholder_email@example.com\")\n\n"
+)
+MEDICAL_RECORDS_SUGGESTION = (
+    "Medical Records:\n"
+    "❌ Vulnerable: patient_name = \"John Smith\"\n"
+    "✅ Secure: patient_name = os.getenv(\"PATIENT_NAME\", \"placeholder_patient_name\")\n\n"
+)
+BEST_PRACTICES_SUGGESTION = (
+    "👆 Best Practices:\n"
+    "• Use environment variables for all sensitive data\n"
+    "• Replace hardcoded values with 'placeholder_value'\n"
+    "• Never commit real secrets to version control\n"
+    "• Implement proper data masking for user-facing content"
+)
+
+# Session risk level bands: scores below the first threshold are MINIMAL,
+# each threshold reached moves one level up
+RISK_LEVEL_THRESHOLDS = (20, 80, 100, 101)
+RISK_LEVELS = ("MINIMAL", "LOW", "MEDIUM", "HIGH", "CRITICAL")
+
+# Summary banner per risk level; anything unrecognized is treated as minimal
+MINIMAL_RISK_BANNER = "✅ MINIMAL RISK. Excellent security practices!"
+RISK_BANNERS = {
+    'CRITICAL': "🚨 CRITICAL RISK detected! IMMEDIATE ACTION REQUIRED.",
+    'HIGH': "🚨 HIGH RISK detected! Please review and address security issues.",
+    'MEDIUM': "⚠️ MEDIUM RISK detected. Consider security improvements.",
+    'LOW': "🟢 LOW RISK detected. Good security practices observed.",
+}
+
+# Code indicators that should match as whole words or specific patterns,
+# combined into a single case-insensitive alternation
+CODE_INDICATOR_REGEX = "(?i)" + "|".join([
+    r'\bdef\s+',           # Python function definition
+    r'\bclass\s+',         # Class definition
+    r'\bimport\s+',        # Import statement
+    r'\bfrom\s+',          # From import
+    r'\bif\s+__name__',    # Python main check
+    r'\bfunction\b',       # Function keyword
+    r'\bvar\s+',           # Variable declaration
+    r'\blet\s+',           # Let declaration
+    r'\bconst\s+',         # Const declaration
+    r'\bpublic\s+',        # Public keyword
+    r'\bprivate\s+',       # Private keyword
+    r'<\?php',             # PHP opening tag
+    r'<script',            # Script tag
+    r'<html',              # HTML tag
+    r'(?-i:\bSELECT\s+)',  # SQL SELECT (uppercase only)
+    r'(?-i:\bINSERT\s+)',  # SQL INSERT (uppercase only)
+    r'(?-i:\bUPDATE\s+)',  # SQL UPDATE (uppercase only)
+    r'\bapi_key\b',       # API key (whole word)
+    r'\bpassword\b',      # Password (whole word)
+    r'\bsecret\b',        # Secret (whole word)
+    r'\btoken\b',         # Token (whole word)
+    r'\bcredentials\b',   # Credentials (whole word)
+])
+
+# Linear-time RE2 matcher when installed, standard re otherwise
+if RE2_AVAILABLE:
+    CODE_INDICATOR_PATTERN = re2.compile(CODE_INDICATOR_REGEX)
+else:
+    CODE_INDICATOR_PATTERN = re.compile(CODE_INDICATOR_REGEX)
+
+
+def _session_start_epoch(session_data: Dict) -> Optional[float]:
+    """Get a session's start time as an epoch, avoiding time.strptime"""
+    start_epoch = session_data.get('session_start_epoch')
+    if start_epoch is not None:
+        return start_epoch
+    
+    # Legacy files only carry the 'YYYY-MM-DD HH:MM:SS' local time string
+    session_start = session_data.get('session_start_time')
+    if not session_start:
+        return None
+    try:
+        return datetime(int(session_start[:4]), int(session_start[5:7]), int(session_start[8:10]),
+                        int(session_start[11:13]), int(session_start[14:16]), int(session_start[17:19])).timestamp()
+    except (ValueError, TypeError) as e:
+        print(f"Error parsing session time: {e}")
+        return None
+
+
+def _read_session_start_epoch(file_path) -> Optional[float]:
+    """Get a session file's start time from the head of the file, parsing the whole file only as a fallback"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        head = f.read(SESSION_FILE_HEAD_SIZE)
+        
+        # The start fields are written right after user_name, ahead of the conversations
+        match = SESSION_START_EPOCH_PATTERN.search(head)
+        if match:
+            return int(match.group(1))
+        match = SESSION_START_TIME_PATTERN.search(head)
+        if match:
+            return _session_start_epoch({'session_start_time': match.group(1)})
+        
+        f.seek(0)
+        return _session_start_epoch(json.load(f))
+
+
+# Analysis results keyed by (model, code), shared across manager instances
+_ANALYSIS_CACHE = OrderedDict()
+_ANALYSIS_CACHE_LOCK = threading.Lock()
+
+
+# (epoch second, formatted local time) of the last _timestamp_now() call
+_LAST_TIMESTAMP = (None, "")
+
+
+def _timestamp_now() -> str:
+    """Current local time as 'YYYY-MM-DD HH:MM:SS', formatted at most once per second"""
+    global _LAST_TIMESTAMP
+    second = int(time.time())
+    cached_second, timestamp = _LAST_TIMESTAMP
+    if second != cached_second:
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second))
+        # Replaced as one tuple so other threads never see a mismatched pair
+        _LAST_TIMESTAMP = (second, timestamp)
+    return timestamp
+
+
+def _has_indented_line(text: str) -> bool:
+    """True if any line of text starts with an INDENT_PREFIXES entry, without splitting it into lines"""
+    start = 0
+    while True:
+        if text.startswith(INDENT_PREFIXES, start):
+            return True
+        start = text.find('\n', start) + 1
+        if not start:
+            return False
+
+
+def _dump_json_file(file_path, data: Dict, indent: bool = True, default=None) -> None:
+    """Write data as JSON (indented or compact), using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=option, default=default))
+    else:
+        with open(file_path, 'w', encoding='utf-8', buffering=JSON_WRITE_BUFFER) as f:
+            if indent:
+                json.dump(data, f, indent=2, ensure_ascii=False, default=default)
+            else:
+                json.dump(data, f, separators=(",", ":"), ensure_ascii=False, default=default)
+
+
+class SessionMetrics:
+    """Running analysis metrics for the current practice session"""
+    
+    __slots__ = (
+        'total_lines',
+        'total_sensitive_fields',
+        'total_sensitive_data',
+        'total_pii',
+        'total_hepa',
+        'total_medical',
+        'total_compliance_api',
+        'risk_score_sum',
+        'risk_score_count',
+        'analysis_count',
+        'current_tokens_per_sec',
+        'current_input_tokens',
+        'current_output_tokens',
+    )
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self) -> None:
+        """Zero all metrics"""
+        self.total_lines = 0
+        self.total_sensitive_fields = 0
+        self.total_sensitive_data = 0
+        self.total_pii = 0
+        self.total_hepa = 0
+        self.total_medical = 0
+        self.total_compliance_api = 0
+        self.risk_score_sum = 0
+        self.risk_score_count = 0
+        self.analysis_count = 0
+        self.current_tokens_per_sec = 0
+        self.current_input_tokens = 0
+        self.current_output_tokens = 0
+
+
 class PracticeSessionManager:
     """Manages practice session functionality with comprehensive tracking"""
     
@@ -27,6 +366,8 @@ class PracticeSessionManager:
         self.user_name = None
         self.session_start_time = None
         self.session_end_time = None
+        self._session_start_mono = None  # time.monotonic() at start, for durations
+        self.session_duration = 0.0
         self.session_id = None
         self.code_analyses = []
         self.total_tokens = 0
@@ -37,11 +378,28 @@ class PracticeSessionManager:
         
         # Global session tracking (one session per user)
         self.active_sessions = {}  # {user_name: session_data}
+        self._session_start_index = {}  # {user_id: latest start epoch} from saved session files
+        self._session_start_index_mtime = None  # Sessions directory mtime the index was built at
         
         # Duplicate code tracking (display purposes only)
         self.duplicate_analysis_count = 0
-        self.unique_code_hashes = set()
+        self.unique_code_hashes = OrderedDict()  # Used as a bounded LRU set
         self.is_current_duplicate = False
+        self._last_code = None
+        self._last_code_len = -1
+        
+        # Output directories are created once here rather than on every save
+        for output_dir in ("core/logs/sessions", "detailed_sessions"):
+            os.makedirs(output_dir, exist_ok=True)
+        
+        # Background writer for session files; pending writes are flushed at exit
+        self._writer_queue = queue.Queue()
+        threading.Thread(target=self._writer_loop, daemon=True).start()
+        atexit.register(self._writer_queue.join)
+        
+        # Debounced active_sessions.json writes
+        self._save_lock = threading.Lock()
+        self._save_timer = None
         
         # Load existing active sessions on startup
         self._load_active_sessions()
@@ -52,37 +410,29 @@ class PracticeSessionManager:
         self.session_timer = None          # Timer object
         
         # Analysis metrics tracking
-        self.session_metrics = {
-            'total_lines': 0,
-            'total_sensitive_fields': 0,
-            'total_sensitive_data': 0,
-            'total_pii': 0,
-            'total_hepa': 0,
-            'total_medical': 0,
-            'total_compliance_api': 0,
-            'risk_scores': [],
-            'analysis_count': 0,
-            'current_tokens_per_sec': 0,
-            'current_input_tokens': 0,
-            'current_output_tokens': 0
-        }
+        self.session_metrics = SessionMetrics()
         
         # Thinking state management
-        self.is_thinking = False
-        self.stop_thinking = False
+        self._thinking_event = threading.Event()  # Set while a worker is generating a response
+        self._stop_event = threading.Event()      # Replaced per request; set when the user cancels it
         self.thinking_thread = None
+        self._streaming_message = False  # True while a streamed AI reply is being appended
+        self._scroll_pending = False  # True while a chat autoscroll is queued for idle time
         
-        # Real-time timer
-        self.timer_running = False
-        self.timer_thread = None
+        # Real-time timer (Tk after() callback id)
+        self._timer_after_id = None
+        self._last_footer_text = None  # Last text pushed to the footer label
     
     def _load_active_sessions(self):
-        """Load active sessions from existing session files"""
+        """Load active sessions from the index file, scanning session files only as a fallback"""
         try:
             sessions_dir = Path("core/logs/sessions")
             if not sessions_dir.exists():
                 return
             
+            if self._load_active_sessions_index(sessions_dir / "active_sessions.json"):
+                return
+            
             for file_path in sessions_dir.glob("practice_*.json"):
                 try:
                     with open(file_path, 'r') as f:
@@ -93,19 +443,14 @@ class PracticeSessionManager:
                         user_name = session_data.get('user_name')
                         if user_name:
                             # Check if session is recent (within last 24 hours)
-                            session_start = session_data.get('session_start_time')
-                            if session_start:
-                                try:
-                                    start_time = time.mktime(time.strptime(session_start, '%Y-%m-%d %H:%M:%S'))
-                                    if time.time() - start_time < 86400:  # 24 hours
-                                        self.active_sessions[user_name] = {
-                                            'session_id': session_data.get('unique_session_id'),
-                                            'start_time': start_time,
-                                            'model': session_data.get('model', 'llama3.2:3b'),
-                                            'manager_instance': self
-                                        }
-                                except Exception as e:
-                                    print(f"Error parsing session time: {e}")
+                            start_time = _session_start_epoch(session_data)
+                            if start_time is not None and time.time() - start_time < 86400:  # 24 hours
+                                self.active_sessions[user_name] = {
+                                    'session_id': session_data.get('unique_session_id'),
+                                    'start_time': start_time,
+                                    'model': session_data.get('model', 'llama3.2:3b'),
+                                    'manager_instance': self
+                                }
                                     
                 except Exception as e:
                     print(f"Error loading session {file_path.name}: {e}")
@@ -113,32 +458,88 @@ class PracticeSessionManager:
         except Exception as e:
             print(f"Error loading active sessions: {e}")
     
-    def _save_active_sessions(self):
+    def _load_active_sessions_index(self, index_file: Path) -> bool:
+        """Load active sessions from active_sessions.json; returns False if missing or corrupt"""
+        try:
+            with open(index_file, 'rb') as f:
+                index = json.load(f)
+            if not isinstance(index, dict):
+                return False
+            
+            now = time.time()
+            for user_name, entry in index.items():
+                # Check if session is recent (within last 24 hours)
+                start_time = entry.get('start_time')
+                if isinstance(start_time, (int, float)) and now - start_time < 86400:  # 24 hours
+                    self.active_sessions[user_name] = {
+                        'session_id': entry.get('session_id'),
+                        'start_time': start_time,
+                        'model': entry.get('model', 'llama3.2:3b'),
+                        'manager_instance': self
+                    }
+            return True
+            
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"Error loading active sessions index: {e}")
+            return False
+    
+    def _schedule_save_active_sessions(self):
+        """Schedule a save of active sessions, coalescing bursts into one write"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(ACTIVE_SESSIONS_SAVE_DELAY, self._flush_active_sessions)
+            self._save_timer.start()
+    
+    def _flush_active_sessions(self):
         """Save active sessions to a tracking file"""
+        with self._save_lock:
+            self._save_timer = None
+            active_sessions = self.active_sessions.copy()
+        
         try:
             sessions_dir = Path("core/logs/sessions")
-            sessions_dir.mkdir(parents=True, exist_ok=True)
             
+            # Write to a temp file and swap it in so readers never see a partial file
             active_sessions_file = sessions_dir / "active_sessions.json"
-            with open(active_sessions_file, 'w') as f:
-                json.dump(self.active_sessions, f, indent=2, default=str)
+            temp_file = active_sessions_file.with_suffix(".json.tmp")
+            _dump_json_file(temp_file, active_sessions, indent=False, default=str)
+            os.replace(temp_file, active_sessions_file)
                 
         except Exception as e:
             print(f"Error saving active sessions: {e}")
     
     def _track_code_analysis(self, code: str):
         """Track code analysis for duplicate detection (display purposes only)"""
-        import hashlib
+        stripped = code.strip()
+        
+        # Resubmitting the last snippet is always a duplicate - skip hashing it
+        if len(stripped) == self._last_code_len and stripped == self._last_code:
+            self.duplicate_analysis_count += 1
+            self.is_current_duplicate = True
+            return
+        self._last_code = stripped
+        self._last_code_len = len(stripped)
         
         # Create hash of the code (normalized)
-        code_hash = hashlib.md5(code.strip().encode()).hexdigest()
+        code_bytes = stripped.encode()
+        if XXHASH_AVAILABLE:
+            code_hash = xxhash.xxh3_64_intdigest(code_bytes)
+        else:
+            code_hash = hashlib.md5(code_bytes).hexdigest()
         
         # Check if this code was analyzed before
-        if code_hash in self.unique_code_hashes:
+        unique_code_hashes = self.unique_code_hashes
+        if code_hash in unique_code_hashes:
+            unique_code_hashes.move_to_end(code_hash)
             self.duplicate_analysis_count += 1
             self.is_current_duplicate = True
         else:
-            self.unique_code_hashes.add(code_hash)
+            unique_code_hashes[code_hash] = None
+            if len(unique_code_hashes) > MAX_UNIQUE_CODE_HASHES:
+                unique_code_hashes.popitem(last=False)
             self.is_current_duplicate = False
     
     def start_session(self, user_id: str, model: str) -> bool:
@@ -152,6 +553,7 @@ class PracticeSessionManager:
             self.session_active = True
             self.user_name = user_id
             self.session_start_time = time.time()
+            self._session_start_mono = time.monotonic()
             self.session_id = f"practice_{user_id}_{int(self.session_start_time)}"
             self.code_analyses = []
             self.total_tokens = 0
@@ -166,28 +568,20 @@ class PracticeSessionManager:
             }
             
             # Save active sessions
-            self._save_active_sessions()
+            self._schedule_save_active_sessions()
             
             # Start session timer if enabled
             self._start_session_timer()
             
             # Reset metrics
-            self.session_metrics = {
-                'total_lines': 0,
-                'total_sensitive_fields': 0,
-                'total_sensitive_data': 0,
-                'total_pii': 0,
-                'total_hepa': 0,
-                'total_medical': 0,
-                'total_compliance_api': 0,
-                'risk_scores': [],
-                'analysis_count': 0
-            }
+            self.session_metrics.reset()
             
             # Reset duplicate tracking for new session
             self.duplicate_analysis_count = 0
-            self.unique_code_hashes = set()
+            self.unique_code_hashes = OrderedDict()
             self.is_current_duplicate = False
+            self._last_code = None
+            self._last_code_len = -1
             
             # Update UI
             self._update_session_info(user_id, model)
@@ -209,7 +603,7 @@ class PracticeSessionManager:
         try:
             # Debug logging
             with open("debug_detailed_sessions.log", "a") as debug_file:
-                debug_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - end_session called for session: {self.session_id}\n")
+                debug_file.write(f"{_timestamp_now()} - end_session called for session: {self.session_id}\n")
             
             if not self.session_active:
                 return False
@@ -219,7 +613,7 @@ class PracticeSessionManager:
             
             # Set end time
             self.session_end_time = time.time()
-            session_duration = self.session_end_time - self.session_start_time
+            self.session_duration = time.monotonic() - self._session_start_mono
             
             # Calculate final metrics
             final_metrics = self._calculate_final_metrics()
@@ -229,28 +623,26 @@ class PracticeSessionManager:
                 "user_name": self.user_name,
                 "session_start_time": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.session_start_time)),
                 "session_end_time": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.session_end_time)),
-                "session_duration": round(session_duration, 2),
+                "session_start_epoch": int(self.session_start_time),
+                "session_duration": round(self.session_duration, 2),
                 "token_count": self.total_tokens,
                 "unique_session_id": self.session_id,
-                "code_analyses": self.code_analyses.copy(),  # Make a copy to avoid potential reference issues
+                "code_analyses": self.code_analyses,
                 "final_analysis_metrics": final_metrics,
                 "message_count": self.message_count,
-                "conversations": self.conversations.copy()  # Include conversation history
+                "conversations": self.conversations  # Include conversation history
             }
             
             # Save session data
             with open("debug_detailed_sessions.log", "a") as debug_file:
-                debug_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - About to call _save_session_data for session: {self.session_id}\n")
+                debug_file.write(f"{_timestamp_now()} - About to call _save_session_data for session: {self.session_id}\n")
             
+            # Queued for the writer thread, which refreshes the scoreboard once written
             self._save_session_data(session_data, final_metrics)
             
-            # Trigger scoreboard refresh
-            self._trigger_scoreboard_refresh()
-            
             # Remove from active sessions
-            if self.user_name in self.active_sessions:
-                del self.active_sessions[self.user_name]
-                self._save_active_sessions()
+            if self.active_sessions.pop(self.user_name, None) is not None:
+                self._schedule_save_active_sessions()
             
             # Stop timer
             self._stop_timer()
@@ -263,35 +655,15 @@ class PracticeSessionManager:
             self.user_name = None
             self.session_start_time = None
             self.session_end_time = None
+            self._session_start_mono = None
             self.session_id = None
             
-            # Reset metrics to 0
+            # Reset metrics to 0 (the saved lists are replaced, not copied)
             self.code_analyses = []
+            self.conversations = []
             self.total_tokens = 0
             self.message_count = 0
-            self.session_metrics = {
-                'lines_of_code': 0,
-                'sensitive_fields': 0,
-                'sensitive_data': 0,
-                'pii_count': 0,
-                'hepa_count': 0,
-                'medical_count': 0,
-                'compliance_api_count': 0,
-                'risk_scores': [],
-                'analysis_count': 0,
-                'total_lines': 0,
-                'total_sensitive_fields': 0,
-                'total_sensitive_data': 0,
-                'total_pii_count': 0,
-                'total_hepa_count': 0,
-                'total_medical_count': 0,
-                'total_compliance_api_count': 0,
-                'current_tokens_per_sec': 0,
-            'current_input_tokens': 0,
-            'current_output_tokens': 0,
-                'current_input_tokens': 0,
-                'current_output_tokens': 0
-            }
+            self.session_metrics.reset()
             
             return True
             
@@ -309,7 +681,6 @@ class PracticeSessionManager:
             self.session_timer.cancel()
             
         # Start new timer (5 minutes * 60 seconds)
-        import threading
         self.session_timer = threading.Timer(
             self.session_timeout_minutes * 60, 
             self._on_session_timeout
@@ -412,7 +783,7 @@ class PracticeSessionManager:
         if not self.session_active:
             return
         
-        if self.is_thinking:
+        if self._thinking_event.is_set():
             return  # Don't send if already thinking
         
         # Increment message count
@@ -421,9 +792,11 @@ class PracticeSessionManager:
         # Add user message to chat
         self._add_user_message(message)
         
-        # Set thinking state
-        self.is_thinking = True
-        self.stop_thinking = False
+        # Set thinking state; a fresh stop event identifies this request, so a
+        # stopped worker that is still winding down cannot touch the new reply
+        self._thinking_event.set()
+        stop_event = threading.Event()
+        self._stop_event = stop_event
         
         # Show thinking indicator
         self.main_app.root.after(0, self._show_thinking_indicator)
@@ -435,7 +808,7 @@ class PracticeSessionManager:
             # Run code analysis in thread
             self.thinking_thread = threading.Thread(
                 target=self._run_code_analysis_thread,
-                args=(message, model),
+                args=(message, model, stop_event),
                 daemon=True
             )
             self.thinking_thread.start()
@@ -443,57 +816,24 @@ class PracticeSessionManager:
             # Run regular chat analysis in thread
             self.thinking_thread = threading.Thread(
                 target=self._run_chat_analysis_thread,
-                args=(message, model),
+                args=(message, model, stop_event),
                 daemon=True
             )
             self.thinking_thread.start()
     
     def _detect_code_in_message(self, message: str) -> bool:
         """Detect if message contains code"""
-        import re
-        
         # Minimum word requirement for code analysis
         words = message.strip().split()
         if len(words) < 3:  # Require at least 3 words for code analysis
             return False
         
-        # Code indicators that should match as whole words or specific patterns
-        code_patterns = [
-            r'\bdef\s+',           # Python function definition
-            r'\bclass\s+',         # Class definition
-            r'\bimport\s+',        # Import statement
-            r'\bfrom\s+',          # From import
-            r'\bif\s+__name__',    # Python main check
-            r'\bfunction\b',       # Function keyword
-            r'\bvar\s+',           # Variable declaration
-            r'\blet\s+',           # Let declaration
-            r'\bconst\s+',         # Const declaration
-            r'\bpublic\s+',        # Public keyword
-            r'\bprivate\s+',       # Private keyword
-            r'<\?php',             # PHP opening tag
-            r'<script',            # Script tag
-            r'<html',              # HTML tag
-            r'\bSELECT\s+',       # SQL SELECT
-            r'\bINSERT\s+',       # SQL INSERT
-            r'\bUPDATE\s+',       # SQL UPDATE
-            r'\bapi_key\b',       # API key (whole word)
-            r'\bpassword\b',      # Password (whole word)
-            r'\bsecret\b',        # Secret (whole word)
-            r'\btoken\b',         # Token (whole word) - FIXED!
-            r'\bcredentials\b'   # Credentials (whole word)
-        ]
-        
-        message_lower = message.lower()
-        for pattern in code_patterns:
-            if re.search(pattern, message_lower):
-                return True
-        
-        # Check for code-like patterns (multiple lines, indentation)
-        lines = message.split('\n')
-        if len(lines) > 2:
-            indented_lines = sum(1 for line in lines if line.startswith('    ') or line.startswith('\t'))
-            if indented_lines > 0:
-                return True
+        if CODE_INDICATOR_PATTERN.search(message):
+            return True
+        
+        # Check for code-like patterns (three or more lines, indentation)
+        if message.count('\n') >= 2 and _has_indented_line(message):
+            return True
         
         return False
     
@@ -501,11 +841,11 @@ class PracticeSessionManager:
     def _show_thinking_indicator(self):
         """Show thinking indicator in chat"""
         try:
-            self.main_app.practice_chat_display.config(state=tk.NORMAL)
-            self.main_app.practice_chat_display.insert(tk.END, f"\n🤖 AI: ", "ai_name")
-            self.main_app.practice_chat_display.insert(tk.END, "Thinking...\n", "ai_response")
-            self.main_app.practice_chat_display.see(tk.END)
-            self.main_app.practice_chat_display.config(state=tk.DISABLED)
+            chat_display = self.main_app.practice_chat_display
+            chat_display.config(state=tk.NORMAL)
+            chat_display.insert(tk.END, "\n🤖 AI: ", "ai_name", "Thinking...\n", "ai_response")
+            chat_display.see(tk.END)
+            chat_display.config(state=tk.DISABLED)
             
             # Enable stop button when AI starts thinking
             self.main_app.practice_stop_btn.config(state=tk.NORMAL)
@@ -514,8 +854,9 @@ class PracticeSessionManager:
     
     def _clear_thinking_indicator(self):
         """Clear thinking indicator from chat WITHOUT resetting formatting"""
+        chat_display = self.main_app.practice_chat_display
         try:
-            self.main_app.practice_chat_display.config(state=tk.NORMAL)
+            chat_display.config(state=tk.NORMAL)
             
             # Don't modify existing content - just let the AI response overwrite it
             # The AI response will come right after the thinking message anyway
@@ -524,106 +865,126 @@ class PracticeSessionManager:
         except Exception as e:
             print(f"Error clearing thinking indicator: {e}")
         finally:
-            self.main_app.practice_chat_display.config(state=tk.DISABLED)
+            chat_display.config(state=tk.DISABLED)
             # Disable stop button when AI stops thinking
             self.main_app.practice_stop_btn.config(state=tk.DISABLED)
     
     def stop_thinking_process(self):
         """Stop the current thinking process"""
-        if self.is_thinking:
-            self.stop_thinking = True
-            self.is_thinking = False
+        if self._thinking_event.is_set():
+            self._stop_event.set()
+            self._thinking_event.clear()
+            self._streaming_message = False
             
             # Provide user feedback
-            self.main_app.practice_chat_display.config(state=tk.NORMAL)
-            self.main_app.practice_chat_display.insert(tk.END, f"\n⏹️ User stopped AI response\n")
-            self.main_app.practice_chat_display.see(tk.END)
-            self.main_app.practice_chat_display.config(state=tk.DISABLED)
+            chat_display = self.main_app.practice_chat_display
+            chat_display.config(state=tk.NORMAL)
+            chat_display.insert(tk.END, f"\n⏹️ User stopped AI response\n")
+            chat_display.see(tk.END)
+            chat_display.config(state=tk.DISABLED)
             
             # Clear thinking indicator and disable stop button
             self.main_app.root.after(0, self._clear_thinking_indicator)
     
-    def _run_code_analysis_thread(self, code: str, model: str) -> None:
+    def _run_code_analysis_thread(self, code: str, model: str, stop_event: threading.Event) -> None:
         """Run code analysis in a separate thread"""
         try:
             # Track code analysis for duplicate detection (display only)
             self._track_code_analysis(code)
             
             # Set model
-            self.ollama_client.set_model(model)
+            self._ensure_model(model)
             
-            # Run analysis
-            result = self.analyzer.analyze_code(code)
+            # Skip the model call if the user already stopped the response
+            if stop_event.is_set():
+                return
             
-            if not self.stop_thinking and result.get('success', False):
-                # Calculate tokens (rough estimate)
-                estimated_tokens = len(code.split()) + len(result.get('raw_response', '').split())
-                self.total_tokens += estimated_tokens
-                
-                # Handle result in main thread
+            # Run analysis (cached results skip the LLM call for repeated code)
+            result = self._analyze_code_cached(code, model)
+            
+            if not stop_event.is_set() and result.get('success', False):
+                # Handle result in main thread; it adds Ollama's reported token counts
                 self.main_app.root.after(0, self._handle_code_analysis_result, result)
             
         except Exception as e:
-            if not self.stop_thinking:
+            if not stop_event.is_set():
                 error_msg = f"Analysis error: {str(e)}"
                 self.main_app.root.after(0, self._handle_analysis_error, error_msg)
         finally:
             # Reset thinking state and clear thinking indicator
-            self.is_thinking = False
-            self.main_app.root.after(0, self._clear_thinking_indicator)
+            self.main_app.root.after(0, self._end_thinking, stop_event)
+    
+    def _is_current_request(self, stop_event: threading.Event) -> bool:
+        """Return True if stop_event belongs to the latest request and it was not stopped"""
+        return stop_event is self._stop_event and not stop_event.is_set()
     
-    def _run_chat_analysis_thread(self, message: str, model: str) -> None:
+    def _end_thinking(self, stop_event: threading.Event) -> None:
+        """Reset the thinking state in the main thread unless a newer request has started"""
+        if stop_event is not self._stop_event:
+            return
+        self._thinking_event.clear()
+        self._clear_thinking_indicator()
+    
+    def _ensure_model(self, model: str) -> None:
+        """Select the model on the Ollama client unless it is already current"""
+        if self.ollama_client.current_model != model:
+            self.ollama_client.set_model(model)
+    
+    def _analyze_code_cached(self, code: str, model: Optional[str] = None) -> Dict:
+        """Analyze code, reusing the result of an identical earlier submission"""
+        cache_key = (model, code)
+        with _ANALYSIS_CACHE_LOCK:
+            cached = _ANALYSIS_CACHE.get(cache_key)
+            if cached is not None:
+                _ANALYSIS_CACHE.move_to_end(cache_key)
+        
+        if cached is not None:
+            # No tokens were spent on this analysis; report the original counts as cached
+            response_data = cached.get('raw_response_data') or {}
+            result = dict(cached)
+            result['raw_response_data'] = {
+                'prompt_eval_count': 0,
+                'eval_count': 0,
+                'total_duration': 0,
+                'cached_tokens': response_data.get('prompt_eval_count', 0) + response_data.get('eval_count', 0)
+            }
+            return result
+        
+        if model is None:
+            result = self.analyzer.analyze_code(code)
+        else:
+            result = self.analyzer.analyze_code(code, model)
+        
+        if result and result.get('success', False):
+            with _ANALYSIS_CACHE_LOCK:
+                _ANALYSIS_CACHE[cache_key] = result
+                if len(_ANALYSIS_CACHE) > ANALYSIS_CACHE_SIZE:
+                    _ANALYSIS_CACHE.popitem(last=False)
+        return result
+    
+    def _run_chat_analysis_thread(self, message: str, model: str, stop_event: threading.Event) -> None:
         """Run chat analysis in a separate thread"""
         try:
             # Set model
-            self.ollama_client.set_model(model)
+            self._ensure_model(model)
             
-            # Create system prompt for security-focused chat
-            system_prompt = """You are a helpful Security Mentor focused on preventing users from sharing sensitive data with LLMs.
-
-**PRIMARY GOAL: Help users sanitize sensitive data before sharing with AI tools.**
-
-When helping users practice secure coding, suggest these specific patterns:
-
-1. **Replace sensitive field names** with generic alternatives:
-   Original: "patient_id", "ssn", "diagnosis" 
-   Secure: "user_id", "id_number", "condition"
-
-2. **Use specific generic placeholders** instead of "placeholder_value":
-   Good patterns: "value_001", "item_a", "standard_config", "default_type"
-   Avoid: "placeholder_value" (too generic)
-
-3. **Replace empty sensitive data** with defaults:
-   Original: "", ""
-   Secure: "standard_value", "default_option"
-
-4. **Environment variables for secrets**:
-   Original: password = "secret123"
-   Secure: password = os.getenv("PASSWORD", "config_value")
-
-Focus responses on:
-- Specifically preventing sensitive data sharing with LLMs
-- Using the exact placeholder patterns shown above
-- Explaining WHY sanitization protects privacy
-- Brief, actionable advice
-
-Keep examples focused on removing sensitive patterns from code."""
+            # Skip the model call if the user already stopped the response
+            if stop_event.is_set():
+                return
             
-            # Generate response
-            full_prompt = f"{system_prompt}\n\nUser: {message}\n\nAssistant:"
-            response_data = self.ollama_client.generate_response(full_prompt, stream=False)
+            # Stream the response so text appears as it is generated
+            full_prompt = MENTOR_PROMPT_PREFIX + message + MENTOR_PROMPT_SUFFIX
+            response_text, response_data = self._stream_ai_response(full_prompt, stop_event)
             
-            if not self.stop_thinking and response_data:
-                # Extract response text and token info
-                response_text = response_data.get('response', '')
-                
+            if not stop_event.is_set() and response_data:
+                # Extract token info
                 # Use Ollama's actual token counts
                 prompt_tokens = response_data.get('total_duration', 0)  # This might not be tokens, let me check better field
                 response_tokens = response_data.get('prompt_eval_count', 0)
                 eval_tokens = response_data.get('eval_count', 0)
                 total_tokens = response_tokens + eval_tokens
                 
-                self.total_tokens += total_tokens
+                self.main_app.root.after(0, self._add_tokens, total_tokens)
                 
                 # Store processing time for tokens/sec calculation
                 processing_duration = response_data.get('total_duration', 0)  # nanoseconds
@@ -631,28 +992,58 @@ Keep examples focused on removing sensitive patterns from code."""
                 
                 # Calculate tokens/sec for this interaction
                 tokens_per_sec = total_tokens / processing_time_sec if processing_time_sec > 0 else 0
-                # REMOVED: self.session_metrics['current_tokens_per_sec'] = tokens_per_sec  # This overwrites!
+                # REMOVED: self.session_metrics.current_tokens_per_sec = tokens_per_sec  # This overwrites!
                 
                 # Handle response in main thread
-                self.main_app.root.after(0, self._handle_chat_response, response_text)
+                self.main_app.root.after(0, self._finish_streamed_ai_message, response_text, stop_event)
             
         except Exception as e:
-            if not self.stop_thinking:
+            if not stop_event.is_set():
                 error_msg = f"Chat error: {str(e)}"
                 self.main_app.root.after(0, self._handle_chat_error, error_msg)
         finally:
             # Reset thinking state and clear thinking indicator
-            self.is_thinking = False
-            self.main_app.root.after(0, self._clear_thinking_indicator)
+            self.main_app.root.after(0, self._end_thinking, stop_event)
+    
+    def _stream_ai_response(self, prompt: str, stop_event: threading.Event) -> Tuple[str, Optional[Dict]]:
+        """Stream a response into the chat display and return its text and Ollama's final chunk
+        
+        The final chunk carries the token counts and timing info; it is None if the
+        user stopped the response before Ollama finished.
+        """
+        chunks = self.ollama_client.generate_response_chunks(prompt)
+        response_parts = []
+        response_data = None
+        try:
+            for chunk in chunks:
+                # Abort generation as soon as the user stops the response
+                if stop_event.is_set():
+                    break
+                text = chunk.get('response', '')
+                if text:
+                    if not response_parts:
+                        self.main_app.root.after(0, self._begin_streamed_ai_message, stop_event)
+                    response_parts.append(text)
+                    self.main_app.root.after(0, self._append_chat_chunk, text, stop_event)
+                if chunk.get('done', False):
+                    response_data = chunk
+        except Exception:
+            # Close out a reply that was cut off partway through the stream
+            self.main_app.root.after(0, self._abort_streamed_ai_message, stop_event)
+            raise
+        finally:
+            chunks.close()
+        return ''.join(response_parts), response_data
     
     def _handle_chat_error(self, error_msg: str):
         """Handle chat error in main thread"""
         try:
             # Add error message
-            self.main_app.practice_chat_display.config(state=tk.NORMAL)
-            self.main_app.practice_chat_display.insert(tk.END, f"❌ Error: {error_msg}\n")
-            self.main_app.practice_chat_display.see(tk.END)
-            self.main_app.practice_chat_display.config(state=tk.DISABLED)
+            chat_display = self.main_app.practice_chat_display
+            chat_display.config(state=tk.NORMAL)
+            chat_display.insert(tk.END, f"❌ Error: {error_msg}\n")
+            chat_display.see(tk.END)
+            chat_display.config(state=tk.DISABLED)
         except Exception as e:
             print(f"Error handling chat error: {e}")
     
@@ -660,36 +1051,35 @@ Keep examples focused on removing sensitive patterns from code."""
         """Handle analysis error in main thread"""
         try:
             # Add error message
-            self.main_app.practice_chat_display.config(state=tk.NORMAL)
-            self.main_app.practice_chat_display.insert(tk.END, f"❌ Analysis Error: {error_msg}\n")
-            self.main_app.practice_chat_display.see(tk.END)
-            self.main_app.practice_chat_display.config(state=tk.DISABLED)
+            chat_display = self.main_app.practice_chat_display
+            chat_display.config(state=tk.NORMAL)
+            chat_display.insert(tk.END, f"❌ Analysis Error: {error_msg}\n")
+            chat_display.see(tk.END)
+            chat_display.config(state=tk.DISABLED)
         except Exception as e:
             print(f"Error handling analysis error: {e}")
     
     def _start_timer(self):
         """Start the real-time timer"""
-        if not self.timer_running:
-            self.timer_running = True
-            self.timer_thread = threading.Thread(target=self._timer_loop, daemon=True)
-            self.timer_thread.start()
+        if self._timer_after_id is None:
+            self._timer_after_id = self.main_app.root.after(1000, self._tick)
     
     def _stop_timer(self):
         """Stop the real-time timer"""
-        self.timer_running = False
-        if self.timer_thread:
-            self.timer_thread.join(timeout=1)
+        if self._timer_after_id is not None:
+            self.main_app.root.after_cancel(self._timer_after_id)
+            self._timer_after_id = None
     
-    def _timer_loop(self):
-        """Timer loop for real-time updates"""
-        while self.timer_running and self.session_active:
-            try:
-                # Update footer in main thread
-                self.main_app.root.after(0, self._update_footer)
-                time.sleep(1)  # Update every second
-            except Exception as e:
-                print(f"Timer error: {e}")
-                break
+    def _tick(self):
+        """Timer tick for real-time updates, rescheduled every second on the Tk event loop"""
+        self._timer_after_id = None
+        try:
+            self._update_footer()
+        except Exception as e:
+            print(f"Timer error: {e}")
+            return
+        if self.session_active:
+            self._timer_after_id = self.main_app.root.after(1000, self._tick)
     
     def _run_code_analysis(self, code: str, model: str) -> None:
         """Run code analysis using the main analysis system"""
@@ -723,7 +1113,7 @@ Keep examples focused on removing sensitive patterns from code."""
             # Run analysis in thread
             analysis_thread = threading.Thread(
                 target=self._chat_analysis_thread,
-                args=(message, model)
+                args=(message, model, self._stop_event)
             )
             analysis_thread.daemon = True
             analysis_thread.start()
@@ -738,10 +1128,10 @@ Keep examples focused on removing sensitive patterns from code."""
             self._track_code_analysis(code)
             
             # Set model
-            self.ollama_client.set_model(model)
+            self._ensure_model(model)
             
             # Use main analysis system
-            raw_result = self.analyzer.analyze_code(code, model)
+            raw_result = self._analyze_code_cached(code, model)
             
             if raw_result and raw_result.get('success', False):
                 # Use corrected analysis_table from OllamaAnalyzer (includes manual line count fix)
@@ -755,8 +1145,7 @@ Keep examples focused on removing sensitive patterns from code."""
                 }
                 self.code_analyses.append(analysis_data)
                 
-                # Update session metrics
-                self._update_session_metrics(analysis_table)
+                # Session metrics are updated once, in _handle_code_analysis_result
                 
                 # Use actual token counts from Ollama if available
                 if 'raw_response_data' in raw_result:
@@ -779,11 +1168,7 @@ Keep examples focused on removing sensitive patterns from code."""
                     processing_duration = response_data.get('total_duration', 0)
                     processing_time_sec = processing_duration / 1_000_000_000 if processing_duration > 0 else 0
                     tokens_per_sec = actual_tokens / processing_time_sec if processing_time_sec > 0 else 0
-                    # REMOVED: self.session_metrics['current_tokens_per_sec'] = tokens_per_sec  # This overwrites!
-                else:
-                    # Fallback: estimate tokens
-                    estimated_tokens = len(code.split()) + len(raw_result['raw_response'].split())
-                    self.total_tokens += estimated_tokens
+                    # REMOVED: self.session_metrics.current_tokens_per_sec = tokens_per_sec  # This overwrites!
                 
                 # Update UI in main thread (pass raw_result for token info)
                 self.main_app.root.after(0, self._handle_code_analysis_result, raw_result)
@@ -792,56 +1177,49 @@ Keep examples focused on removing sensitive patterns from code."""
                 self.main_app.root.after(0, self._handle_chat_response, error_msg)
             
         except Exception as e:
-            import traceback
             # Update analyses count even on error to track attempts
-            self.session_metrics['analysis_count'] += 1
+            self.main_app.root.after(0, self._count_failed_analysis)
             error_msg = f"Error analyzing code: {str(e)}"
             self.main_app.root.after(0, self._handle_chat_response, error_msg)
     
-    def _chat_analysis_thread(self, message: str, model: str) -> None:
+    def _chat_analysis_thread(self, message: str, model: str, stop_event: threading.Event) -> None:
         """Run chat analysis in separate thread"""
         try:
             # Set model
-            self.ollama_client.set_model(model)
+            self._ensure_model(model)
             
-            # Create security analysis prompt
-            system_prompt = f"""You are an AI Security Mentor. Analyze the user's message for potential security issues, sensitive data exposure, or security best practices. Provide helpful guidance and recommendations.
-
-Focus on:
-- Sensitive data exposure (passwords, API keys, personal info)
-- Security vulnerabilities
-- Best practices
-- Compliance concerns (HIPAA, PCI-DSS, etc.)
-
-Be educational and helpful, not just critical."""
+            # Skip the model call if the user already stopped the response
+            if stop_event.is_set():
+                return
             
-            full_prompt = f"{system_prompt}\n\nUser message: {message}"
+            full_prompt = ANALYSIS_PROMPT_PREFIX + message
             
-            # Get LLM response
-            response_data = self.ollama_client.generate_response(full_prompt, stream=False)
+            # Stream the LLM response so text appears as it is generated
+            ai_response, response_data = self._stream_ai_response(full_prompt, stop_event)
             
-            if not self.stop_thinking and response_data:
-                # Extract response text
-                ai_response = response_data.get('response', '')
-                
+            if not stop_event.is_set() and response_data:
                 # Use actual token counts from Ollama
                 prompt_tokens = response_data.get('prompt_eval_count', 0)
                 eval_tokens = response_data.get('eval_count', 0)
                 total_tokens = prompt_tokens + eval_tokens
                 
-                self.total_tokens += total_tokens
+                self.main_app.root.after(0, self._add_tokens, total_tokens)
                 
                 # Store tokens/sec for code analysis
                 processing_duration = response_data.get('total_duration', 0)  # nanoseconds
                 processing_time_sec = processing_duration / 1_000_000_000 if processing_duration > 0 else 0
                 tokens_per_sec = total_tokens / processing_time_sec if processing_time_sec > 0 else 0
-                # REMOVED: self.session_metrics['current_tokens_per_sec'] = tokens_per_sec  # This overwrites!
+                # REMOVED: self.session_metrics.current_tokens_per_sec = tokens_per_sec  # This overwrites!
+                
+                # Replace the streamed text with the formatted response in main thread
+                self.main_app.root.after(0, self._finish_streamed_ai_message, ai_response, stop_event)
+                return
+            
+            # Handle case when the response was stopped or response_data is None
+            if stop_event.is_set():
+                ai_response = "Response stopped by user."
             else:
-                # Handle case when stop_thinking is True or response_data is None
-                if self.stop_thinking:
-                    ai_response = "Response stopped by user."
-                else:
-                    ai_response = "I'm sorry, I couldn't process your message. Please try again."
+                ai_response = "I'm sorry, I couldn't process your message. Please try again."
             
             # Update UI in main thread
             self.main_app.root.after(0, self._handle_chat_response, ai_response)
@@ -875,9 +1253,9 @@ Be educational and helpful, not just critical."""
             tokens_per_sec = actual_tokens / processing_time_sec if processing_time_sec > 0 else 0
             
             # Store individual token counts for footer display
-            self.session_metrics['current_tokens_per_sec'] = tokens_per_sec
-            self.session_metrics['current_input_tokens'] = prompt_tokens
-            self.session_metrics['current_output_tokens'] = eval_tokens
+            self.session_metrics.current_tokens_per_sec = tokens_per_sec
+            self.session_metrics.current_input_tokens = prompt_tokens
+            self.session_metrics.current_output_tokens = eval_tokens
         
         # Extract the actual analysis data from the result
         if 'analysis_table' in raw_result and raw_result['analysis_table']:
@@ -896,62 +1274,113 @@ Be educational and helpful, not just critical."""
         self._update_session_metrics(actual_analysis_data)
         
         # Format analysis results
-        analysis_summary = self._format_code_analysis_summary(actual_analysis_data)
-        self._add_ai_message(analysis_summary)
+        ai_messages = [self._format_code_analysis_summary(actual_analysis_data)]
         
         # Add secure coding suggestions with placeholders
         secure_suggestions = self._generate_secure_coding_suggestions(actual_analysis_data)
         if secure_suggestions:
-            self._add_ai_message(secure_suggestions)
+            ai_messages.append(secure_suggestions)
+        
+        # Insert summary and suggestions in a single chat update
+        self._add_ai_messages(ai_messages)
         
         # Update footer
         self._update_footer()
     
     def _generate_secure_coding_suggestions(self, analysis_data: Dict) -> str:
         """Generate secure coding suggestions with placeholder examples"""
-        suggestions = []
+        sensitive_data = analysis_data.get('sensitive_data', 0)
+        pii_count = analysis_data.get('pii_count', 0)
+        hepa_count = analysis_data.get('hepa_count', 0)
+        medical_count = analysis_data.get('medical_count', 0)
+        compliance_api_count = analysis_data.get('compliance_api_count', 0)
         
         # Check if we have detected sensitive data
         has_sensitive_data = (
-            analysis_data.get('sensitive_data', 0) > 0 or
-            analysis_data.get('pii_count', 0) > 0 or
-            analysis_data.get('hepa_count', 0) > 0 or
-            analysis_data.get('medical_count', 0) > 0 or
-            analysis_data.get('compliance_api_count', 0) > 0
+            sensitive_data > 0 or
+            pii_count > 0 or
+            hepa_count > 0 or
+            medical_count > 0 or
+            compliance_api_count > 0
         )
         
         if has_sensitive_data:
-            suggestions.append("🔒 SECURE CODING SUGGESTIONS:")
-            suggestions.append("")
-            
-            if analysis_data.get('compliance_api_count', 0) > 0:
-                suggestions.append("API Keys & Secrets:")
-                suggestions.append("❌ Vulnerable: api_key = \"sk-1234567890abcdef\"")
-                suggestions.append("✅ Secure: api_key = os.getenv(\"API_KEY\", \"placeholder_value\")")
-                suggestions.append("")
-            
-            if analysis_data.get('pii_count', 0) > 0:
-                suggestions.append("Personal Information:")
-                suggestions.append("❌ Vulnerable: user_email = \"john.doe@example.com\"")
-                suggestions.append("✅ Secure: user_email = os.getenv(\"USER_EMAIL\", \"placeholder_email@example.com\")")
-                suggestions.append("")
-            
-            if analysis_data.get('medical_count', 0) > 0:
-                suggestions.append("Medical Records:")
-                suggestions.append("❌ Vulnerable: patient_name = \"John Smith\"")
-                suggestions.append("✅ Secure: patient_name = os.getenv(\"PATIENT_NAME\", \"placeholder_patient_name\")")
-                suggestions.append("")
-            
-            suggestions.append("👆 Best Practices:")
-            suggestions.append("• Use environment variables for all sensitive data")
-            suggestions.append("• Replace hardcoded values with 'placeholder_value'")
-            suggestions.append("• Never commit real secrets to version control")
-            suggestions.append("• Implement proper data masking for user-facing content")
-            
-            return "\n".join(suggestions)
+            return (
+                f"{SUGGESTIONS_HEADER}"
+                f"{API_SECRETS_SUGGESTION if compliance_api_count > 0 else ''}"
+                f"{PERSONAL_INFO_SUGGESTION if pii_count > 0 else ''}"
+                f"{MEDICAL_RECORDS_SUGGESTION if medical_count > 0 else ''}"
+                f"{BEST_PRACTICES_SUGGESTION}"
+            )
         
         return ""  # No suggestions if no sensitive data detected
     
+    def _begin_streamed_ai_message(self, stop_event: threading.Event) -> None:
+        """Start an AI message whose text arrives in streamed chunks"""
+        if not self._is_current_request(stop_event):
+            return
+        chat_display = self.main_app.practice_chat_display
+        chat_display.config(state=tk.NORMAL)
+        chat_display.insert(tk.END, "AI Security Mentor: ", "ai_name")
+        # Left gravity keeps the mark in front of the text streamed after it
+        chat_display.mark_set("ai_stream_start", "end-1c")
+        chat_display.mark_gravity("ai_stream_start", tk.LEFT)
+        chat_display.see(tk.END)
+        chat_display.config(state=tk.DISABLED)
+        self._streaming_message = True
+    
+    def _append_chat_chunk(self, text: str, stop_event: threading.Event) -> None:
+        """Append a streamed chunk of AI response text"""
+        if not self._streaming_message or not self._is_current_request(stop_event):
+            return
+        chat_display = self.main_app.practice_chat_display
+        chat_display.config(state=tk.NORMAL)
+        chat_display.insert(tk.END, text, "ai_response")
+        chat_display.config(state=tk.DISABLED)
+        
+        # Scroll once per idle cycle rather than once per chunk
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            self.main_app.root.after_idle(self._scroll_chat_to_end)
+    
+    def _scroll_chat_to_end(self) -> None:
+        """Scroll the chat display to the latest streamed text"""
+        self._scroll_pending = False
+        self.main_app.practice_chat_display.see(tk.END)
+    
+    def _finish_streamed_ai_message(self, response: str, stop_event: threading.Event) -> None:
+        """Replace the raw streamed text with the color-coded response"""
+        if not self._is_current_request(stop_event):
+            return
+        if not self._streaming_message:
+            self._handle_chat_response(response)
+            return
+        self._streaming_message = False
+        
+        chat_display = self.main_app.practice_chat_display
+        chat_display.config(state=tk.NORMAL)
+        chat_display.delete("ai_stream_start", "end-1c")
+        chat_display.mark_unset("ai_stream_start")
+        self._format_and_insert_ai_content(response)
+        chat_display.see(tk.END)
+        chat_display.config(state=tk.DISABLED)
+        
+        self._capture_ai_conversation(response)
+        self._update_footer()
+    
+    def _abort_streamed_ai_message(self, stop_event: threading.Event) -> None:
+        """End a streamed AI message that was cut off, keeping the text received so far"""
+        if stop_event is not self._stop_event or not self._streaming_message:
+            return
+        self._streaming_message = False
+        
+        chat_display = self.main_app.practice_chat_display
+        chat_display.config(state=tk.NORMAL)
+        chat_display.insert(tk.END, "\n")
+        chat_display.mark_unset("ai_stream_start")
+        chat_display.see(tk.END)
+        chat_display.config(state=tk.DISABLED)
+    
     def _handle_chat_response(self, response: str) -> None:
         """Handle chat response in main thread"""
         # Add AI response
@@ -973,8 +1402,8 @@ Be educational and helpful, not just critical."""
         # Determine risk level using RiskCalculator's thresholds
         risk_level = self.main_app.risk_calculator._determine_risk_level(risk_score)
         
-        # Get session totals
-        session_totals = self._get_session_totals()
+        # Session totals are read straight from the running metrics
+        session_metrics = self.session_metrics
         avg_risk_score = self._get_average_risk_score()
         avg_risk_level = self.main_app.risk_calculator._determine_risk_level(avg_risk_score)
         
@@ -993,93 +1422,72 @@ Be educational and helpful, not just critical."""
 • Risk Score: {risk_score}/100 ({risk_level} RISK)
 
 📈 Session Totals:
-• Total Lines: {session_totals['total_lines']}
-• Total Sensitive Fields: {session_totals['total_sensitive_fields']}
-• Total Sensitive Data: {session_totals['total_sensitive_data']}
-• Total PII: {session_totals['total_pii']}
-• Total Medical: {session_totals['total_medical']}
-• Total API/Security: {session_totals['total_compliance_api']}
+• Total Lines: {session_metrics.total_lines}
+• Total Sensitive Fields: {session_metrics.total_sensitive_fields}
+• Total Sensitive Data: {session_metrics.total_sensitive_data}
+• Total PII: {session_metrics.total_pii}
+• Total Medical: {session_metrics.total_medical}
+• Total API/Security: {session_metrics.total_compliance_api}
 • Average Risk Score: {avg_risk_score:.1f}/100 ({avg_risk_level} RISK)
-• Total Analyses: {self.session_metrics['analysis_count']}
+• Total Analyses: {session_metrics.analysis_count}
 • Unique Code Analyses: {len(self.unique_code_hashes)}
 • Duplicate Analyses: {self.duplicate_analysis_count}
 
 """
         
         # Risk banner based on current analysis risk level
-        if risk_level == 'CRITICAL':
-            summary += "🚨 CRITICAL RISK detected! IMMEDIATE ACTION REQUIRED."
-        elif risk_level == 'HIGH':
-            summary += "🚨 HIGH RISK detected! Please review and address security issues."
-        elif risk_level == 'MEDIUM':
-            summary += "⚠️ MEDIUM RISK detected. Consider security improvements."
-        elif risk_level == 'LOW':
-            summary += "🟢 LOW RISK detected. Good security practices observed."
-        else: # minimal
-            summary += "✅ MINIMAL RISK. Excellent security practices!"
-            
-        summary += "\n"
-        
-        return summary
+        return f"{summary}{RISK_BANNERS.get(risk_level, MINIMAL_RISK_BANNER)}\n"
+    
+    def _add_tokens(self, token_count: int) -> None:
+        """Add tokens to the session total (main thread only, so no locking is needed)"""
+        if self.session_active:
+            self.total_tokens += token_count
+    
+    def _count_failed_analysis(self) -> None:
+        """Count a failed analysis attempt (main thread only)"""
+        self.session_metrics.analysis_count += 1
     
     def _update_session_metrics(self, analysis_data: Dict) -> None:
         """Update session metrics with new analysis data"""
-        self.session_metrics['total_lines'] += analysis_data.get('lines', 0)
-        self.session_metrics['total_sensitive_fields'] += analysis_data.get('sensitive_fields', 0)
-        self.session_metrics['total_sensitive_data'] += analysis_data.get('sensitive_data', 0)
-        self.session_metrics['total_pii'] += analysis_data.get('pii', 0)
-        self.session_metrics['total_hepa'] += analysis_data.get('hepa', 0)
-        self.session_metrics['total_medical'] += analysis_data.get('medical', 0)
-        self.session_metrics['total_compliance_api'] += analysis_data.get('compliance_api', 0)
-        self.session_metrics['risk_scores'].append(analysis_data.get('risk_score', 0))
-        self.session_metrics['analysis_count'] += 1
-    
-    def _get_session_totals(self) -> Dict:
-        """Get current session totals"""
-        return {
-            'total_lines': self.session_metrics['total_lines'],
-            'total_sensitive_fields': self.session_metrics['total_sensitive_fields'],
-            'total_sensitive_data': self.session_metrics['total_sensitive_data'],
-            'total_pii': self.session_metrics['total_pii'],
-            'total_medical': self.session_metrics['total_medical'],
-            'total_compliance_api': self.session_metrics['total_compliance_api']
-        }
+        self.session_metrics.total_lines += analysis_data.get('lines', 0)
+        self.session_metrics.total_sensitive_fields += analysis_data.get('sensitive_fields', 0)
+        self.session_metrics.total_sensitive_data += analysis_data.get('sensitive_data', 0)
+        self.session_metrics.total_pii += analysis_data.get('pii', 0)
+        self.session_metrics.total_hepa += analysis_data.get('hepa', 0)
+        self.session_metrics.total_medical += analysis_data.get('medical', 0)
+        self.session_metrics.total_compliance_api += analysis_data.get('compliance_api', 0)
+        self.session_metrics.risk_score_sum += analysis_data.get('risk_score', 0)
+        self.session_metrics.risk_score_count += 1
+        self.session_metrics.analysis_count += 1
     
     def _get_average_risk_score(self) -> float:
         """Get average risk score for the session"""
-        if not self.session_metrics['risk_scores']:
+        session_metrics = self.session_metrics
+        if not session_metrics.risk_score_count:
             return 0.0
-        return sum(self.session_metrics['risk_scores']) / len(self.session_metrics['risk_scores'])
+        return session_metrics.risk_score_sum / session_metrics.risk_score_count
     
     def _get_risk_level(self, risk_score: float) -> str:
         """Get risk level based on score"""
-        if risk_score >= 101:
-            return "CRITICAL"
-        elif risk_score >= 100:
-            return "HIGH"
-        elif risk_score >= 80:
-            return "MEDIUM"
-        elif risk_score >= 20:
-            return "LOW"
-        else:
-            return "MINIMAL"
+        return RISK_LEVELS[bisect_right(RISK_LEVEL_THRESHOLDS, risk_score)]
     
     def _calculate_final_metrics(self) -> Dict:
         """Calculate final metrics for the session"""
+        session_metrics = self.session_metrics
         avg_risk_score = self._get_average_risk_score()
         avg_risk_level = self._get_risk_level(avg_risk_score)
         
         return {
-            "total_lines": self.session_metrics['total_lines'],
-            "total_sensitive_fields": self.session_metrics['total_sensitive_fields'],
-            "total_sensitive_data": self.session_metrics['total_sensitive_data'],
-            "total_pii": self.session_metrics['total_pii'],
-            "total_hepa": self.session_metrics['total_hepa'],
-            "total_medical": self.session_metrics['total_medical'],
-            "total_compliance_api": self.session_metrics['total_compliance_api'],
+            "total_lines": session_metrics.total_lines,
+            "total_sensitive_fields": session_metrics.total_sensitive_fields,
+            "total_sensitive_data": session_metrics.total_sensitive_data,
+            "total_pii": session_metrics.total_pii,
+            "total_hepa": session_metrics.total_hepa,
+            "total_medical": session_metrics.total_medical,
+            "total_compliance_api": session_metrics.total_compliance_api,
             "average_risk_score": round(avg_risk_score, 2),
             "risk_level": avg_risk_level,
-            "total_analyses": self.session_metrics['analysis_count']
+            "total_analyses": session_metrics.analysis_count
         }
     
     def _save_session_data(self, session_data: Dict, final_metrics: Dict) -> None:
@@ -1087,20 +1495,14 @@ Be educational and helpful, not just critical."""
         try:
             # Debug logging
             with open("debug_detailed_sessions.log", "a") as debug_file:
-                debug_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - _save_session_data called for session: {self.session_id}\n")
-            
-            # Create sessions directory
-            sessions_dir = "core/logs/sessions"
-            os.makedirs(sessions_dir, exist_ok=True)
+                debug_file.write(f"{_timestamp_now()} - _save_session_data called for session: {self.session_id}\n")
             
             # Create filename
+            sessions_dir = "core/logs/sessions"
             filename = f"{sessions_dir}/{self.session_id}.json"
             
-            # Save to JSON file
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(session_data, f, indent=2, ensure_ascii=False)
-            
-            print(f"Practice session data saved to: {filename}")
+            # Save to JSON file on the writer thread
+            self._writer_queue.put((filename, session_data, "Practice session data"))
             
             # Also save detailed analysis data to separate file
             self._save_analysis_details(final_metrics)
@@ -1110,32 +1512,65 @@ Be educational and helpful, not just critical."""
             
             # Debug logging for error
             with open("debug_detailed_sessions.log", "a") as debug_file:
-                debug_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - ERROR in _save_session_data: {e}\n")
+                debug_file.write(f"{_timestamp_now()} - ERROR in _save_session_data: {e}\n")
+    
+    def _writer_loop(self):
+        """Write queued session files in the background, refreshing the scoreboard when drained.
+        
+        Queued data may be a callable, which is called here to build the data to write.
+        """
+        while True:
+            file_path, data, label = self._writer_queue.get()
+            try:
+                if callable(data):
+                    data = data()
+                
+                # Write to a temp file and swap it in so readers never see a partial file
+                temp_file = f"{file_path}.tmp"
+                _dump_json_file(temp_file, data)
+                os.replace(temp_file, file_path)
+                
+                print(f"{label} saved to: {file_path}")
+                with open("debug_detailed_sessions.log", "a") as debug_file:
+                    debug_file.write(f"{_timestamp_now()} - {label} saved: {file_path}\n")
+                
+            except Exception as e:
+                print(f"Error saving {label.lower()}: {e}")
+                with open("debug_detailed_sessions.log", "a") as debug_file:
+                    debug_file.write(f"{_timestamp_now()} - ERROR saving {label.lower()}: {e}\n")
+            finally:
+                self._writer_queue.task_done()
+            
+            # Trigger scoreboard refresh once everything queued so far is on disk
+            if self._writer_queue.empty():
+                try:
+                    self.main_app.root.after(0, self._trigger_scoreboard_refresh)
+                except Exception as e:
+                    print(f"Could not schedule scoreboard refresh: {e}")
     
     def _save_analysis_details(self, final_metrics: Dict) -> None:
         """Save detailed analysis data to detailed_sessions folder for risk viewer"""
         try:
             # Debug logging
             with open("debug_detailed_sessions.log", "a") as debug_file:
-                debug_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - _save_analysis_details called for session: {self.session_id}\n")
+                debug_file.write(f"{_timestamp_now()} - _save_analysis_details called for session: {self.session_id}\n")
             
             # Check if we have any analysis data (either from code_analyses or final_analysis_metrics)
             has_code_analyses = bool(self.code_analyses)
             has_final_metrics = bool(final_metrics)
             
             with open("debug_detailed_sessions.log", "a") as debug_file:
-                debug_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - has_code_analyses: {has_code_analyses}, has_final_metrics: {has_final_metrics}\n")
-                debug_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - final_metrics content: {final_metrics}\n")
+                debug_file.write(f"{_timestamp_now()} - has_code_analyses: {has_code_analyses}, has_final_metrics: {has_final_metrics}\n")
+                debug_file.write(f"{_timestamp_now()} - final_metrics content: {final_metrics}\n")
             
             if not has_code_analyses and not has_final_metrics:
                 with open("debug_detailed_sessions.log", "a") as debug_file:
-                    debug_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - No analysis data available to save detailed session\n")
+                    debug_file.write(f"{_timestamp_now()} - No analysis data available to save detailed session\n")
                 print("No analysis data available to save detailed session")
                 return  # No analyses to save
             
-            # Create detailed_sessions directory (where risk viewer looks)
+            # Detailed_sessions directory (where risk viewer looks)
             detailed_sessions_dir = "detailed_sessions"
-            os.makedirs(detailed_sessions_dir, exist_ok=True)
             
             # Use the passed final_metrics directly
             final_metrics_to_use = final_metrics
@@ -1146,8 +1581,8 @@ Be educational and helpful, not just critical."""
                 "user_name": self.user_name,
                 "session_start_time": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.session_start_time)),
                 "session_end_time": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.session_end_time)),
-                "session_duration": self.session_end_time - self.session_start_time,
-                "analysis_timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
+                "session_duration": self.session_duration,
+                "analysis_timestamp": _timestamp_now(),
                 "code_length": final_metrics_to_use.get('total_lines', 0),
                 "risk_score": final_metrics_to_use.get('average_risk_score', 0),
                 "risk_level": final_metrics_to_use.get('risk_level', 'UNKNOWN'),
@@ -1176,7 +1611,7 @@ Be educational and helpful, not just critical."""
                 },
                 "session_totals": final_metrics_to_use,
                 "code_content": "",
-                "conversations": self.conversations.copy() if hasattr(self, 'conversations') else []
+                "conversations": self.conversations
             }
             
             # Extract code content from analyses or conversations
@@ -1192,40 +1627,41 @@ Be educational and helpful, not just critical."""
                         detailed_session["code_content"] = code_content
                         break
             
-            # Parse code content to extract sensitive items
-            if code_content:
-                sensitive_items = self._parse_sensitive_items_from_code(code_content, final_metrics_to_use)
-                
-                # Update current_analysis with parsed items
-                detailed_session["current_analysis"]["sensitive_fields"]["items"] = sensitive_items.get('sensitive_fields', [])
-                detailed_session["current_analysis"]["sensitive_data"]["items"] = sensitive_items.get('sensitive_data', [])
-                detailed_session["current_analysis"]["pii"]["items"] = sensitive_items.get('pii', [])
-                detailed_session["current_analysis"]["medical"]["items"] = sensitive_items.get('medical', [])
-                detailed_session["current_analysis"]["api_security"]["items"] = sensitive_items.get('api_security', [])
-            
-            # Save to detailed_sessions directory with _detailed.json suffix
+            # Save to detailed_sessions directory with _detailed.json suffix; the
+            # sensitive items are parsed on the writer thread, off the UI thread
             detailed_filename = f"{detailed_sessions_dir}/{self.session_id}_detailed.json"
-            with open(detailed_filename, 'w', encoding='utf-8') as f:
-                json.dump(detailed_session, f, indent=2, ensure_ascii=False)
-            
-            print(f"Detailed session data saved to: {detailed_filename}")
-            
-            # Also write to debug log file
-            with open("debug_detailed_sessions.log", "a") as debug_file:
-                debug_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - Detailed session saved: {detailed_filename}\n")
+            if code_content:
+                self._writer_queue.put((
+                    detailed_filename,
+                    lambda: self._add_sensitive_items(detailed_session, code_content, final_metrics_to_use),
+                    "Detailed session data"
+                ))
+            else:
+                self._writer_queue.put((detailed_filename, detailed_session, "Detailed session data"))
             
         except Exception as e:
             print(f"Error saving detailed session data: {e}")
             
             # Also write error to debug log file
             with open("debug_detailed_sessions.log", "a") as debug_file:
-                debug_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - ERROR saving detailed session: {e}\n")
+                debug_file.write(f"{_timestamp_now()} - ERROR saving detailed session: {e}\n")
+    
+    def _add_sensitive_items(self, detailed_session: Dict, code_content: str, final_metrics: Dict) -> Dict:
+        """Parse code content and fill the detailed session's per-category items"""
+        sensitive_items = self._parse_sensitive_items_from_code(code_content, final_metrics)
+        
+        # Update current_analysis with parsed items
+        current_analysis = detailed_session["current_analysis"]
+        current_analysis["sensitive_fields"]["items"] = sensitive_items.get('sensitive_fields', [])
+        current_analysis["sensitive_data"]["items"] = sensitive_items.get('sensitive_data', [])
+        current_analysis["pii"]["items"] = sensitive_items.get('pii', [])
+        current_analysis["medical"]["items"] = sensitive_items.get('medical', [])
+        current_analysis["api_security"]["items"] = sensitive_items.get('api_security', [])
+        return detailed_session
     
     def _parse_sensitive_items_from_code(self, code_content: str, final_metrics: Dict) -> Dict:
         """Parse code content to extract sensitive items for detailed analysis"""
         try:
-            import re
-            
             lines = code_content.split('\n')
             sensitive_items = {
                 'sensitive_fields': [],
@@ -1235,79 +1671,55 @@ Be educational and helpful, not just critical."""
                 'api_security': []
             }
             
-            # Define patterns for different types of sensitive data
-            patterns = {
-                'pii': [
-                    r'(?:ssn|social_security|date_of_birth|birth_date|phone|email|address|full_name|first_name|last_name)\s*[:=]\s*["\']([^"\']+)["\']',
-                    r'["\']([0-9]{3}-[0-9]{2}-[0-9]{4})["\']',  # SSN pattern
-                    r'["\']([0-9]{2}/[0-9]{2}/[0-9]{4})["\']',  # Date pattern
-                    r'["\'](\([0-9]{3}\)\s*[0-9]{3}-[0-9]{4})["\']',  # Phone pattern
-                ],
-                'medical': [
-                    r'(?:patient_id|medical_record|diagnosis|medication|allergy|blood_type|prescription|lab_result|medical_data)\s*[:=]\s*["\']([^"\']+)["\']',
-                    r'["\'](PAT-[0-9]+)["\']',  # Patient ID pattern
-                    r'["\'](MR-[0-9]+)["\']',   # Medical record pattern
-                    r'["\'](RX-[0-9]+)["\']',   # Prescription pattern
-                ],
-                'api_security': [
-                    r'(?:api_key|secret_key|password|token|auth|credential|private_key|encryption_key)\s*[:=]\s*["\']([^"\']+)["\']',
-                    r'["\'](sk-[a-zA-Z0-9]+)["\']',  # API key pattern
-                    r'["\'](Bearer\s+[a-zA-Z0-9]+)["\']',  # Bearer token pattern
-                    r'["\'](-----BEGIN\s+PRIVATE\s+KEY-----[^"]+)["\']',  # Private key pattern
-                ]
-            }
+            # Scan the whole buffer once per pattern, then restore the per-line order
+            # (line, then pattern, then position) the items are reported in
+            matches = []
+            for pattern_index, (category, pattern) in enumerate(SENSITIVE_VALUE_PATTERNS):
+                for m in pattern.finditer(code_content):
+                    matches.append((m.start(), pattern_index, category, m.group(1)))
+            
+            # Map match offsets to line numbers by binary search over newline offsets
+            newline_offsets = []
+            if matches:
+                index = code_content.find('\n')
+                while index != -1:
+                    newline_offsets.append(index)
+                    index = code_content.find('\n', index + 1)
+            matches = sorted(
+                (bisect_left(newline_offsets, start) + 1, pattern_index, start, category, value)
+                for start, pattern_index, category, value in matches
+            )
             
-            # Extract items from code
-            for line_num, line in enumerate(lines, 1):
-                line_lower = line.lower()
+            for line_num, _, _, category, match in matches:
+                # Truncate very long values
+                display_value = match[:50] + "..." if len(match) > 50 else match
                 
-                # Check each category
-                for category, pattern_list in patterns.items():
-                    for pattern in pattern_list:
-                        matches = re.findall(pattern, line, re.IGNORECASE)
-                        for match in matches:
-                            if isinstance(match, tuple):
-                                match = match[0] if match[0] else match[1]
-                            
-                            # Truncate very long values
-                            display_value = match[:50] + "..." if len(match) > 50 else match
-                            
-                            item = {
-                                'name': display_value,
-                                'line': line_num,
-                                'category': category.title(),
-                                'type': 'sensitive_data'
-                            }
-                            
-                            # Add to appropriate category
-                            if category == 'pii':
-                                sensitive_items['pii'].append(item)
-                            elif category == 'medical':
-                                sensitive_items['medical'].append(item)
-                            elif category == 'api_security':
-                                sensitive_items['api_security'].append(item)
-                            
-                            # Also add to general sensitive_data
-                            sensitive_items['sensitive_data'].append(item)
+                item = {
+                    'name': display_value,
+                    'line': line_num,
+                    'category': category.title(),
+                    'type': 'sensitive_data'
+                }
                 
+                # Add to appropriate category, and also to general sensitive_data
+                sensitive_items[category].append(item)
+                sensitive_items['sensitive_data'].append(item)
+            
+            # Extract items from code
+            for line_num, line in enumerate(lines, 1):
                 # Extract field names (variable names)
-                field_patterns = [
-                    r'(?:patient_id|ssn|api_key|secret_key|password|token|email|phone|address|full_name|date_of_birth|diagnosis|medication|allergy|blood_type)',
-                ]
-                
-                for pattern in field_patterns:
-                    if re.search(pattern, line_lower):
-                        # Extract the variable name
-                        var_match = re.search(r'(\w+)\s*[:=]', line)
-                        if var_match:
-                            field_name = var_match.group(1)
-                            item = {
-                                'name': field_name,
-                                'line': line_num,
-                                'category': 'General',
-                                'type': 'sensitive_field'
-                            }
-                            sensitive_items['sensitive_fields'].append(item)
+                if SENSITIVE_FIELD_PATTERN.search(line):
+                    # Extract the variable name
+                    var_match = VARIABLE_NAME_PATTERN.search(line)
+                    if var_match:
+                        field_name = var_match.group(1)
+                        item = {
+                            'name': field_name,
+                            'line': line_num,
+                            'category': 'General',
+                            'type': 'sensitive_field'
+                        }
+                        sensitive_items['sensitive_fields'].append(item)
             
             return sensitive_items
             
@@ -1363,60 +1775,83 @@ Let's start with secure coding practices!"""
         
         # Capture conversation data
         conversation_entry = {
-            "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "timestamp": _timestamp_now(),
             "user": self.user_name,
             "message": message,
             "message_type": "code_submission" if self._detect_code_in_message(message) else "text",
             "session_id": self.session_id
         }
-        self.conversations.append(conversation_entry)
+        self._append_conversation(conversation_entry)
     
     def _add_ai_message(self, message: str) -> None:
         """Add AI message to chat with color coding and capture conversation"""
-        # Add to UI
-        self.main_app.practice_chat_display.config(state=tk.NORMAL)
-        self.main_app.practice_chat_display.insert(tk.END, "AI Security Mentor: ", "ai_name")
-        
-        # Format and insert message with color coding
-        self._format_and_insert_ai_content(message)
-        self.main_app.practice_chat_display.see(tk.END)
-        self.main_app.practice_chat_display.config(state=tk.DISABLED)
+        self._add_ai_messages((message,))
+    
+    def _add_ai_messages(self, messages) -> None:
+        """Add several AI messages with one chat state toggle and scroll"""
+        chat_display = self.main_app.practice_chat_display
+        chat_display.config(state=tk.NORMAL)
+        for message in messages:
+            chat_display.insert(tk.END, "AI Security Mentor: ", "ai_name")
+            
+            # Format and insert message with color coding
+            self._format_and_insert_ai_content(message)
+        chat_display.see(tk.END)
+        chat_display.config(state=tk.DISABLED)
         
-        # Capture AI conversation data
+        for message in messages:
+            self._capture_ai_conversation(message)
+    
+    def _append_conversation(self, conversation_entry: Dict) -> None:
+        """Record a conversation entry, dropping the oldest beyond the per-session cap"""
+        conversations = self.conversations
+        conversations.append(conversation_entry)
+        if len(conversations) > MAX_CONVERSATION_ENTRIES:
+            del conversations[0]
+    
+    def _capture_ai_conversation(self, message: str) -> None:
+        """Capture AI conversation data for the detailed log viewer"""
         conversation_entry = {
-            "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "timestamp": _timestamp_now(),
             "user": "AI Security Mentor",
             "message": message,
             "message_type": "analysis_response",
             "session_id": self.session_id
         }
-        self.conversations.append(conversation_entry)
+        self._append_conversation(conversation_entry)
     
     def _format_and_insert_ai_content(self, message: str) -> None:
         """Format and insert AI message content with color coding"""
-        lines = message.split('\n')
+        # Alternating text/tag arguments for a single multi-segment Text.insert call;
+        # newlines stay untagged and runs of them are merged into one segment
+        segments = []
         
-        for line in lines:
+        for line in message.split('\n'):
             line = line.strip()
-            if not line:
-                self.main_app.practice_chat_display.insert(tk.END, "\n")
-                continue
-                
-            # Check for code-like content (contains specific patterns)
-            if ('```' in line or 'def ' in line or (line.count('=') > 0 and not line.startswith('=')) or 
-                'return ' in line or line.startswith('api_key') or line.startswith('password') or 
-                line.startswith('TOKEN') or '_key' in line or 'secret' in line.lower()):
-                # Code suggestion - orange
-                self.main_app.practice_chat_display.insert(tk.END, line, "code_suggestion")
-            elif ('tip:' in line.lower() or 'recommendation:' in line.lower() or 
-                  'best practice:' in line.lower() or 'security tip:' in line.lower()):
-                # Security tip - sky blue
-                self.main_app.practice_chat_display.insert(tk.END, line, "security_tip")
-            else:
-                # Regular AI response - light green
-                self.main_app.practice_chat_display.insert(tk.END, line, "ai_response")
+            if line:
+                # Check for code-like content (contains specific patterns)
+                if CODE_LINE_PATTERN.search(line):
+                    # Code suggestion - orange
+                    segments += (line, "code_suggestion")
+                elif ':' in line and SECURITY_TIP_PATTERN.search(line):
+                    # Security tip - sky blue
+                    segments += (line, "security_tip")
+                else:
+                    # Regular AI response - light green
+                    segments += (line, "ai_response")
             
-            self.main_app.practice_chat_display.insert(tk.END, "\n")
+            if segments and segments[-1] == "":
+                segments[-2] += "\n"
+            else:
+                segments += ("\n", "")
+        
+        chat_display = self.main_app.practice_chat_display
+        chat_display.insert(tk.END, *segments)
+        
+        # Keep the chat widget bounded; the full history is kept in self.conversations
+        line_count = int(chat_display.index("end-1c").split('.')[0])
+        if line_count > MAX_CHAT_DISPLAY_LINES:
+            chat_display.delete("1.0", f"{line_count - CHAT_DISPLAY_TRIM_LINES}.0")
     
     
     def _update_footer(self) -> None:
@@ -1425,14 +1860,15 @@ Let's start with secure coding practices!"""
             if not self.session_active:
                 footer_text = "Ready to start practice session"
             else:
-                duration = time.time() - self.session_start_time
+                duration = time.monotonic() - self._session_start_mono
+                session_metrics = self.session_metrics
                 
                 # Get current tokens/sec from Ollama processing  
-                current_tokens_per_sec = self.session_metrics.get('current_tokens_per_sec', 0)
+                current_tokens_per_sec = session_metrics.current_tokens_per_sec
                 
                 # Create detailed token breakdown like Ollama verbose output
-                current_input_tokens = self.session_metrics.get('current_input_tokens', 0)
-                current_output_tokens = self.session_metrics.get('current_output_tokens', 0)
+                current_input_tokens = session_metrics.current_input_tokens
+                current_output_tokens = session_metrics.current_output_tokens
                 
                 if current_input_tokens > 0 or current_output_tokens > 0:
                     token_breakdown = f"📥 Token Input: {current_input_tokens}  📤 Token Output: {current_output_tokens}  ⚡ Rate: {current_tokens_per_sec:.1f}/s"
@@ -1440,15 +1876,18 @@ Let's start with secure coding practices!"""
                     token_breakdown = ""
                 
                 # Create brief analysis summary (remove commas from numbers)
-                avg_risk = sum(self.session_metrics['risk_scores'])/len(self.session_metrics['risk_scores']) if self.session_metrics['risk_scores'] else 0
-                analysis_summary = f"Lines: {self.session_metrics['total_lines']} Fields: {self.session_metrics['total_sensitive_fields']} Data: {self.session_metrics['total_sensitive_data']} Risk: {avg_risk:.1f}"
+                avg_risk = self._get_average_risk_score()
+                analysis_summary = f"Lines: {session_metrics.total_lines} Fields: {session_metrics.total_sensitive_fields} Data: {session_metrics.total_sensitive_data} Risk: {avg_risk:.1f}"
                 
                 if token_breakdown:
-                    footer_text = f"Session Duration: {duration:.0f}s | Messages: {self.message_count} | Total Tokens: {self.total_tokens} | {token_breakdown} | Analyses: {self.session_metrics['analysis_count']} | {analysis_summary}"
+                    footer_text = f"Session Duration: {duration:.0f}s | Messages: {self.message_count} | Total Tokens: {self.total_tokens} | {token_breakdown} | Analyses: {session_metrics.analysis_count} | {analysis_summary}"
                 else:
-                    footer_text = f"Session Duration: {duration:.0f}s | Messages: {self.message_count} | Total Tokens: {self.total_tokens} | Analyses: {self.session_metrics['analysis_count']} | {analysis_summary}"
+                    footer_text = f"Session Duration: {duration:.0f}s | Messages: {self.message_count} | Total Tokens: {self.total_tokens} | Analyses: {session_metrics.analysis_count} | {analysis_summary}"
             
-            self.main_app.practice_token_details_var.set(footer_text)
+            # Only touch the Tk variable (and redraw the label) when the text changed
+            if footer_text != self._last_footer_text:
+                self._last_footer_text = footer_text
+                self.main_app.practice_token_details_var.set(footer_text)
         except Exception as e:
             print(f"Error updating footer: {e}")
     
@@ -1465,13 +1904,11 @@ Let's start with secure coding practices!"""
     def _trigger_scoreboard_refresh(self):
         """Trigger scoreboard refresh if available"""
         try:
-            # Check if main app has scoreboard viewer
-            if hasattr(self.main_app, 'scoreboard_viewer') and self.main_app.scoreboard_viewer:
-                self.main_app.scoreboard_viewer.refresh_data()
-            elif hasattr(self.main_app, 'open_scoreboard'):
-                # If scoreboard is not open, we can't refresh it directly
-                # The scoreboard will pick up the new data on next auto-refresh
-                pass
+            # Check if main app has scoreboard viewer; if the scoreboard is not open,
+            # it picks up the new data on its next auto-refresh
+            scoreboard_viewer = getattr(self.main_app, 'scoreboard_viewer', None)
+            if scoreboard_viewer:
+                scoreboard_viewer.refresh_data()
         except Exception as e:
             print(f"Could not refresh scoreboard: {e}")
     
@@ -1481,27 +1918,43 @@ Let's start with secure coding practices!"""
         if user_id in self.active_sessions:
             return True
         
-        # Check for existing session files
+        # Check for existing session files (recent = within last 24 hours)
+        start_time = self._get_session_start_index().get(user_id)
+        return start_time is not None and time.time() - start_time < 86400
+    
+    def _get_session_start_index(self) -> Dict[str, float]:
+        """Latest session start epoch per user from saved session files.
+        
+        The files are only read again when the sessions directory changes.
+        """
         sessions_dir = Path("core/logs/sessions")
-        if sessions_dir.exists():
-            for file_path in sessions_dir.glob(f"practice_{user_id}_*.json"):
+        try:
+            dir_mtime = sessions_dir.stat().st_mtime_ns
+        except OSError:
+            return {}
+        if dir_mtime == self._session_start_index_mtime:
+            return self._session_start_index
+        
+        index = {}
+        with os.scandir(sessions_dir) as entries:
+            for entry in entries:
+                # File names are practice_{user_id}_{start epoch}.json
+                name = entry.name
+                if not (name.startswith("practice_") and name.endswith(".json")):
+                    continue
+                user_id = name[len("practice_"):-len(".json")].rpartition('_')[0]
+                if not user_id:
+                    continue
                 try:
-                    with open(file_path, 'r') as f:
-                        session_data = json.load(f)
-                    
-                    # Check if session is recent (within last 24 hours)
-                    session_start = session_data.get('session_start_time')
-                    if session_start:
-                        try:
-                            start_time = time.mktime(time.strptime(session_start, '%Y-%m-%d %H:%M:%S'))
-                            if time.time() - start_time < 86400:  # 24 hours
-                                return True
-                        except Exception:
-                            pass
+                    start_time = _read_session_start_epoch(entry.path)
                 except Exception:
-                    pass
+                    continue
+                if start_time is not None and start_time > index.get(user_id, float('-inf')):
+                    index[user_id] = start_time
         
-        return False
+        self._session_start_index = index
+        self._session_start_index_mtime = dir_mtime
+        return index
     
     def get_active_sessions(self) -> Dict:
         """Get all active sessions"""
@@ -1520,8 +1973,8 @@ Let's start with secure coding practices!"""
         # For other users, just remove from active sessions
         # (This is a simplified approach - in a real multi-user system,
         # you'd need to communicate with the actual session instance)
-        del self.active_sessions[user_id]
-        self._save_active_sessions()
+        self.active_sessions.pop(user_id, None)
+        self._schedule_save_active_sessions()
         return True
     
     def force_end_all_sessions(self) -> int:
@@ -1537,7 +1990,7 @@ Let's start with secure coding practices!"""
         # Clear remaining active sessions
         remaining_count = len(self.active_sessions)
         self.active_sessions.clear()
-        self._save_active_sessions()
+        self._schedule_save_active_sessions()
         ended_count += remaining_count
         
         return ended_count
@@ -1547,8 +2000,6 @@ Let's start with secure coding practices!"""
         Corrects AI analysis by verifying sensitive data instances against the code.
         If a flagged field has an empty string or None, it's not counted as data.
         """
-        import re
-        
         try:
             corrected_data = analysis_data.copy()
             initial_data_count = corrected_data.get("sensitive_data", 0)
@@ -1575,15 +2026,7 @@ Let's start with secure coding practices!"""
                     data_points_to_remove += 1
             
             # --- NEW SECOND PASS: Check for common false positives ---
-            # Regex to find things the AI mistakes for data but aren't, like f-string fragments or placeholders.
-            false_positive_patterns = [
-                re.compile(r'f["\']Bearer\s*\{.*?\}["\']'), # f-string "Bearer {token}"
-                re.compile(r'["\']\s*{.*}\s*["\']'),       # Quoted curly braces "{}" - CORRECTED
-                re.compile(r'["\']0\.0\.0\.0["\']'),          # Placeholder IPs
-                re.compile(r'["\']127\.0\.0\.1["\']'),        # Localhost
-            ]
-
-            for pattern in false_positive_patterns:
+            for pattern in FALSE_POSITIVE_PATTERNS:
                 # If we find these patterns, it's likely the AI miscounted them as data
                 if pattern.search(code_content):
                     data_points_to_remove += 1 # Increment for each type of false positive found
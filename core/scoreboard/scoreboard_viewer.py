@@ -14,6 +14,41 @@ import re
 from dataclasses import dataclass
 from collections import defaultdict
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Runs of whitespace, collapsed to a single space when normalizing
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Patterns used by normalize_code_line to canonicalize variable and function names
+VARIABLE_SPLIT_PATTERN = re.compile(r'[\[\.]')
+IDENTIFIER_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+FUNCTION_CALL_PATTERN = re.compile(r'^([a-zA-Z_][a-zA-Z0-9_]*)\(')
+LEADING_IDENTIFIER_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*')
+
+# Dynamic content stripped from input previews before grouping repeated submissions
+DYNAMIC_CONTENT_PATTERNS = [
+    re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+'),  # Timestamps
+    re.compile(r'session_\w+_\d+'),  # Session IDs
+    re.compile(r'Practice session started for user: \w+'),  # Session start messages
+    re.compile(r'Session completed for user: \w+'),  # Session end messages
+]
+
+
+def _loads_json(raw: bytes):
+    """Parse JSON bytes, using orjson when it is installed"""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _loads_jsonl(raw: bytes) -> List[Dict]:
+    """Parse JSON Lines bytes into a list of log entries, skipping blank lines"""
+    # Split the whole buffer in C rather than iterating the file line by line
+    return [_loads_json(line) for line in raw.splitlines() if line.strip()]
+
+
 @dataclass
 class UserScoreboardEntry:
     user_id: str
@@ -40,6 +75,7 @@ class ScoreboardViewer:
         self.session_data = {}
         self.user_stats = {}
         self.refresh_interval = 30000  # 30 seconds
+        self._file_cache = {}  # {path: ((mtime_ns, size), parsed data)} from the last load
         
         self.setup_ui()
         self.load_data()
@@ -171,19 +207,19 @@ class ScoreboardViewer:
         self.session_data = {}
         logs_dir = Path("core/logs")
         
+        # Files that are gone or failed to parse drop out of the cache
+        file_cache = {}
+        
         if not logs_dir.exists():
+            self._file_cache = file_cache
             return
             
         # Load analysis sessions (session_*.json)
         for file_path in logs_dir.glob("session_*.json"):
             session_id = file_path.stem  # Keep the full session ID including "session_"
             try:
-                with open(file_path, 'r') as f:
-                    logs = []
-                    for line in f:
-                        if line.strip():
-                            logs.append(json.loads(line.strip()))
-                    self.session_data[session_id] = logs
+                logs = self._load_file_cached(file_path, _loads_jsonl, file_cache)
+                self.session_data[session_id] = logs
             except Exception as e:
                 print(f"Error loading session {session_id}: {e}")
         
@@ -193,16 +229,32 @@ class ScoreboardViewer:
             for file_path in sessions_dir.glob("practice_*.json"):
                 session_id = file_path.stem
                 try:
-                    with open(file_path, 'r') as f:
-                        session_data = json.load(f)
-                        # Convert practice session to scoreboard format
-                        self.session_data[session_id] = [session_data]
+                    session_data = self._load_file_cached(file_path, _loads_json, file_cache)
+                    # Convert practice session to scoreboard format
+                    self.session_data[session_id] = [session_data]
                 except Exception as e:
                     print(f"Error loading practice session {session_id}: {e}")
+        
+        self._file_cache = file_cache
                 
         self.calculate_user_stats()
         self.update_scoreboard()
         
+    def _load_file_cached(self, file_path: Path, parse, file_cache: Dict):
+        """Parse a file, reusing the last load's result while its mtime and size are unchanged"""
+        stat = file_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cache_key = str(file_path)
+        
+        cached = self._file_cache.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            parsed = cached[1]
+        else:
+            parsed = parse(file_path.read_bytes())
+        
+        file_cache[cache_key] = (signature, parsed)
+        return parsed
+        
     def calculate_user_stats(self):
         """Calculate comprehensive user statistics with duplicate prevention"""
         self.user_stats = {}
@@ -390,10 +442,8 @@ class ScoreboardViewer:
         
     def normalize_code_line(self, line: str) -> str:
         """Normalize code line to detect duplicates"""
-        import re
-        
         # Remove extra whitespace
-        normalized = re.sub(r'\s+', ' ', line.strip())
+        normalized = WHITESPACE_PATTERN.sub(' ', line.strip())
         
         # Remove comments (lines starting with # or //)
         if normalized.startswith('#') or normalized.startswith('//'):
@@ -408,18 +458,18 @@ class ScoreboardViewer:
                 value_part = parts[1].strip()
                 
                 # Extract variable name (before any brackets or dots)
-                var_name = re.split(r'[\[\.]', var_part)[0].strip()
+                var_name = VARIABLE_SPLIT_PATTERN.split(var_part, 1)[0].strip()
                 
                 # If it looks like a variable assignment, normalize it
-                if re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', var_name):
+                if IDENTIFIER_PATTERN.match(var_name):
                     return f"VAR = {value_part}"
         
         # For function calls, normalize function names
         # e.g., "authenticate_user()" becomes "FUNC()"
         if '(' in normalized and ')' in normalized:
-            func_match = re.match(r'^([a-zA-Z_][a-zA-Z0-9_]*)\(', normalized)
+            func_match = FUNCTION_CALL_PATTERN.match(normalized)
             if func_match:
-                return re.sub(r'^[a-zA-Z_][a-zA-Z0-9_]*', 'FUNC', normalized)
+                return LEADING_IDENTIFIER_PATTERN.sub('FUNC', normalized)
         
         return normalized
         
@@ -534,6 +584,7 @@ class ScoreboardViewer:
     def count_unique_detected_flags(self, logs: List[Dict]) -> int:
         """Count detected flags with proper handling of repeated submissions"""
         seen_field_content_pairs = set()
+        seen_contents_by_field = defaultdict(list)  # Field name -> contents seen for it
         detected_flags_count = 0
         
         # Process all logs to count all detected flags
@@ -561,16 +612,17 @@ class ScoreboardViewer:
                 is_duplicate = False
                 normalized_content = content.lower().strip()
                 
-                for seen_pair in seen_field_content_pairs:
-                    seen_field, seen_content = seen_pair.split(":", 1)
-                    if (seen_field == field_name and 
-                        (normalized_content in seen_content or seen_content in normalized_content) and 
-                        len(normalized_content) > 3):
-                        is_duplicate = True
-                        break
+                if len(normalized_content) > 3:
+                    for seen_content in seen_contents_by_field.get(field_name, ()):
+                        if normalized_content in seen_content or seen_content in normalized_content:
+                            is_duplicate = True
+                            break
                 
                 if not is_duplicate:
                     seen_field_content_pairs.add(field_content_key)
+                    # Grouped the way the key splits, matching how pairs were compared before
+                    seen_field, seen_content = field_content_key.split(":", 1)
+                    seen_contents_by_field[seen_field].append(seen_content)
                     detected_flags_count += 1
                     
         return detected_flags_count
@@ -581,18 +633,11 @@ class ScoreboardViewer:
         normalized = input_preview
         
         # Remove common dynamic patterns
-        patterns_to_remove = [
-            r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+',  # Timestamps
-            r'session_\w+_\d+',  # Session IDs
-            r'Practice session started for user: \w+',  # Session start messages
-            r'Session completed for user: \w+',  # Session end messages
-        ]
-        
-        for pattern in patterns_to_remove:
-            normalized = re.sub(pattern, '', normalized)
+        for pattern in DYNAMIC_CONTENT_PATTERNS:
+            normalized = pattern.sub('', normalized)
         
         # Normalize whitespace
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        normalized = WHITESPACE_PATTERN.sub(' ', normalized).strip()
         
         return normalized
         
@@ -1523,6 +1523,9 @@ Last Updated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             recent_sessions = sessions[:10]
             
             if recent_sessions:
+                # 'YYYY-MM-DD HH:MM:SS' strings sort chronologically, so end times are
+                # compared against a cutoff string instead of being parsed one by one
+                recent_end_cutoff = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(time.time() - 3600))
                 for session in recent_sessions:
                     user = session.get('user_name', 'Unknown')
                     session_id = session.get('unique_session_id', session.get('session_id', 'Unknown'))
@@ -1533,13 +1536,9 @@ Last Updated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                     # Determine if session is active (no end time or very recent)
                     is_active = end_time is None
                     if end_time:
-                        try:
-                            # Check if ended recently (within last hour)
-                            end_timestamp = time.mktime(time.strptime(end_time, '%Y-%m-%d %H:%M:%S'))
-                            if time.time() - end_timestamp < 3600:  # 1 hour
-                                is_active = True
-                        except:
-                            pass
+                        # Check if ended recently (within last hour)
+                        if isinstance(end_time, str) and len(end_time) == 19 and end_time > recent_end_cutoff:
+                            is_active = True
                     
                     status_icon = "🟢" if is_active else "🔴"
                     status_text = "Active" if is_active else "Ended"